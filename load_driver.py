@@ -0,0 +1,282 @@
+"""
+Нагрузочный прогон YaNews или YaNote без сторонних библиотек.
+
+Скрипт повторяет смесь адресов из `news/urls.py` или `notes/urls.py`
+против запущенного сервера и печатает p50/p95/p99 по каждому адресу
+и в целом. Каждый поток входит под своим пользователем из созданных
+командами `generate_news` и `generate_notes` (`load_0`, `load_1`...).
+Если в базе уже были такие пользователи, команда продолжает нумерацию
+и печатает `--first-user` и `--users` для этого скрипта.
+Ответ 429 учитывается отдельно: это сработавшее ограничение частоты,
+а не ошибка.
+
+Пример:
+
+    cd ya_news && python manage.py generate_news
+    python manage.py runserver --noreload
+    python ../load_driver.py news --requests 5000 --concurrency 16
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler
+from urllib.request import Request, build_opener
+
+PERCENTILES = (50, 95, 99)
+SLUG_RE = re.compile(r'href="/note/([\w-]+)/"')
+SEARCH_WORDS = ('ва', 'ло', 'ми', 'ра', 'те', 'новость', 'заметка')
+
+# Адрес, его вес в смеси и функция, строящая запрос: (метод, путь, данные).
+NEWS_MIX = (
+    ('home', 30, lambda rng, ids: ('GET', '/', None)),
+    ('detail', 30, lambda rng, ids: (
+        'GET', f'/news/{rng.choice(ids)}/', None
+    )),
+    ('comments', 10, lambda rng, ids: (
+        'GET', f'/news/{rng.choice(ids)}/comments/', None
+    )),
+    ('search', 5, lambda rng, ids: (
+        'GET', '/search/?' + urlencode({'q': rng.choice(SEARCH_WORDS)}), None
+    )),
+    ('api-news', 10, lambda rng, ids: ('GET', '/api/v1/news/', None)),
+    ('api-news-detail', 5, lambda rng, ids: (
+        'GET', f'/api/v1/news/{rng.choice(ids)}/', None
+    )),
+    ('api-comments', 8, lambda rng, ids: (
+        'GET', f'/api/v1/news/{rng.choice(ids)}/comments/', None
+    )),
+    ('comment', 2, lambda rng, ids: (
+        'POST', f'/news/{rng.choice(ids)}/', {'text': 'Нагрузочный тест.'}
+    )),
+)
+
+NOTES_MIX = (
+    ('home', 10, lambda rng, slugs: ('GET', '/', None)),
+    ('list', 40, lambda rng, slugs: ('GET', '/notes/', None)),
+    ('detail', 35, lambda rng, slugs: (
+        'GET', f'/note/{rng.choice(slugs)}/', None
+    )),
+    ('search', 10, lambda rng, slugs: (
+        'GET', '/search/?' + urlencode({'q': rng.choice(SEARCH_WORDS)}), None
+    )),
+    ('add', 5, lambda rng, slugs: ('POST', '/add/', {
+        'title': 'Нагрузочный тест',
+        'text': 'Заметка нагрузочного теста.',
+    })),
+)
+
+
+class NoRedirect(HTTPRedirectHandler):
+    """Замеряем сам запрос, а не переход по редиректу."""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Session:
+    """Клиент одного пользователя: куки, CSRF-токен, вход."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(
+            HTTPCookieProcessor(self.cookies), NoRedirect
+        )
+
+    def cookie(self, name):
+        for cookie in self.cookies:
+            if cookie.name == name:
+                return cookie.value
+        return None
+
+    def request(self, method, path, data=None):
+        """Возвращает код ответа и тело."""
+        headers = {}
+        body = None
+        if method == 'POST':
+            body = urlencode(data or {}).encode()
+            headers['X-CSRFToken'] = self.cookie('csrftoken') or ''
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        request = Request(
+            self.base_url + path, data=body, headers=headers, method=method
+        )
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except HTTPError as error:
+            return error.code, error.read()
+
+    def login(self, username, password):
+        self.request('GET', '/auth/login/')
+        self.request('POST', '/auth/login/', {
+            'username': username,
+            'password': password,
+        })
+        if self.cookie('sessionid') is None:
+            raise SystemExit(f'Не удалось войти как {username}.')
+
+
+def news_targets(session, pages):
+    """Ключи новостей из API: первые `pages` страниц ленты."""
+    ids = []
+    path = '/api/v1/news/?fields=id'
+    for _ in range(pages):
+        status, body = session.request('GET', path)
+        if status != 200:
+            break
+        data = json.loads(body)
+        ids.extend(row['id'] for row in data['results'])
+        if not data['next_cursor']:
+            break
+        path = '/api/v1/news/?' + urlencode(
+            {'fields': 'id', 'cursor': data['next_cursor']}
+        )
+    return ids
+
+
+def note_targets(session, pages):
+    """Slug заметок пользователя со страницы списка."""
+    status, body = session.request('GET', '/notes/')
+    return SLUG_RE.findall(body.decode()) if status == 200 else []
+
+
+class Stats:
+    """Времена ответов и коды по каждому адресу."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.limited = defaultdict(int)
+
+    def record(self, route, status, elapsed):
+        with self.lock:
+            if status == 429:
+                self.limited[route] += 1
+            elif status >= 400:
+                self.errors[route] += 1
+            self.timings[route].append(elapsed)
+
+    def report(self, wall_time):
+        routes = sorted(self.timings)
+        every = [t for route in routes for t in self.timings[route]]
+        header = ('route', 'count', 'errors', '429') + tuple(
+            f'p{p} ms' for p in PERCENTILES
+        )
+        print(('{:16}' + '{:>9}' * (len(header) - 1)).format(*header))
+        for route in routes:
+            self.print_row(
+                route,
+                self.timings[route],
+                self.errors[route],
+                self.limited[route],
+            )
+        self.print_row(
+            'total',
+            every,
+            sum(self.errors.values()),
+            sum(self.limited.values()),
+        )
+        print(f'{len(every) / wall_time:.0f} req/s за {wall_time:.1f} с')
+
+    @staticmethod
+    def print_row(route, timings, errors, limited):
+        values = [
+            percentile(timings, p) * 1000 for p in PERCENTILES
+        ]
+        print(('{:16}{:>9}{:>9}{:>9}' + '{:>9.1f}' * len(values)).format(
+            route, len(timings), errors, limited, *values
+        ))
+
+
+def percentile(values, p):
+    """Перцентиль по ближайшему рангу."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def worker(number, args, mix, discover, stats):
+    rng = random.Random(args.seed + number)
+    session = Session(args.base_url, args.timeout)
+    user = args.first_user + number % args.users
+    session.login(f'{args.user_prefix}{user}', args.password)
+    targets = discover(session, args.pages)
+    if not targets:
+        raise SystemExit('Нет данных для запросов: запустите генератор.')
+    names = [name for name, _, _ in mix]
+    weights = [weight for _, weight, _ in mix]
+    builders = {name: build for name, _, build in mix}
+    for _ in range(args.requests // args.concurrency):
+        route = rng.choices(names, weights=weights)[0]
+        method, path, data = builders[route](rng, targets)
+        started = time.perf_counter()
+        try:
+            status, _ = session.request(method, path, data)
+        except URLError:
+            status = 599
+        stats.record(route, status, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('app', choices=('news', 'notes'))
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument(
+        '--users',
+        type=int,
+        default=100,
+        help='Сколько пользователей генератора задействовать.',
+    )
+    parser.add_argument(
+        '--first-user',
+        type=int,
+        default=0,
+        help='Номер первого пользователя генератора (load_N).',
+    )
+    parser.add_argument('--user-prefix', default='load_')
+    parser.add_argument('--password', default='load-password')
+    parser.add_argument(
+        '--pages',
+        type=int,
+        default=5,
+        help='Сколько страниц API читать в поисках новостей.',
+    )
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.app == 'news':
+        mix, discover = NEWS_MIX, news_targets
+    else:
+        mix, discover = NOTES_MIX, note_targets
+    stats = Stats()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        futures = [
+            pool.submit(worker, number, args, mix, discover, stats)
+            for number in range(args.concurrency)
+        ]
+        for future in futures:
+            future.result()
+    stats.report(time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Стоимость запроса: HTML-страницы против JSON API.
+
+Сравниваются пары, отдающие мобильному приложению одни и те же
+данные: лента новостей и страница новости с комментариями. HTML
+запрашивает авторизованный читатель, чтобы страница не бралась
+из кэша ленты. Условия те же, что в `bench_detail`.
+
+Запуск из каталога ya_news:
+
+    python -m benchmarks.bench_api --requests 500 --comments 20
+"""
+import argparse
+import os
+
+from benchmarks.bench_detail import measure, setup_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--comments', type=int, default=20)
+    parser.add_argument('--news', type=int, default=30)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+    django.setup()
+
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    from news.models import News, summarize
+
+    production = override_settings(DEBUG=False, ALLOWED_HOSTS=['testserver'])
+    with production:
+        user, news = setup_database(args.comments)
+        text = 'Text ' * 50
+        News.objects.bulk_create(
+            News(title=f'News {i}', text=text, summary=summarize(text))
+            for i in range(args.news - 1)
+        )
+        reader = Client()
+        reader.force_login(user)
+        client = Client()
+        pairs = (
+            (
+                'news list',
+                lambda: reader.get(reverse('news:home')),
+                lambda: client.get(reverse('news:api-news')),
+            ),
+            (
+                'news + comments',
+                lambda: reader.get(reverse('news:detail', args=(news.pk,))),
+                lambda: (
+                    client.get(
+                        reverse('news:api-news-detail', args=(news.pk,))
+                    ),
+                    client.get(reverse('news:api-comments', args=(news.pk,))),
+                ),
+            ),
+        )
+        print(f'news: {args.news}, comments: {args.comments}')
+        for name, html, api in pairs:
+            html_rate = measure(html, args.requests, args.rounds)
+            api_rate = measure(api, args.requests, args.rounds)
+            print(
+                f'{name:16} HTML {html_rate:6.0f} req/s   '
+                f'API {api_rate:6.0f} req/s   '
+                f'x{api_rate / html_rate:.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Пропускная способность страницы новости `news:detail`.
+
+Страница открывается авторизованным читателем (без кэша ленты),
+а отклонённый комментарий проверяет путь повторной отрисовки
+формы. Запросы идут через тестовый клиент со всеми middleware
+во временный файл SQLite с теми же настройками, что у основной базы,
+и с `DEBUG = False`, как в работе. Реплика, как в тестах, — зеркало
+этой базы. Файл удаляется после замера и не задевает тестовую базу
+pytest.
+
+Запуск из каталога ya_news:
+
+    python -m benchmarks.bench_detail --requests 500 --comments 20
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def create_database(directory):
+    """Создаёт базу замера в `directory`; возвращает исходное имя."""
+    from django.conf import settings
+    from django.db import connection, connections
+
+    connection.settings_dict['TEST']['NAME'] = str(
+        Path(directory) / 'bench.sqlite3'
+    )
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True
+    )
+    connections[settings.REPLICA_DATABASE].creation.set_as_test_mirror(
+        connection.settings_dict
+    )
+    return old_name
+
+
+def fill_database(comments):
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    user = get_user_model().objects.create(username='reader')
+    news = News.objects.create(title='Benchmark', text='Benchmark text')
+    Comment.objects.bulk_create(
+        Comment(news=news, author=user, text=f'Comment {i}')
+        for i in range(comments)
+    )
+    News.recount_comments()
+    return user, news
+
+
+def measure(send, requests, rounds):
+    """Лучшая пропускная способность из нескольких замеров, в req/s."""
+    send()
+    best = 0.0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(requests):
+            send()
+        best = max(best, requests / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--comments', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    from news.forms import BAD_WORDS
+
+    production = override_settings(
+        DEBUG=False,
+        ALLOWED_HOSTS=['testserver'],
+        RATE_LIMITS={},
+    )
+    with production, tempfile.TemporaryDirectory() as directory:
+        old_name = create_database(directory)
+        try:
+            user, news = fill_database(args.comments)
+            client = Client()
+            client.force_login(user)
+            url = reverse('news:detail', args=(news.pk,))
+            get = measure(
+                lambda: client.get(url), args.requests, args.rounds
+            )
+            rejected = measure(
+                lambda: client.post(url, {'text': BAD_WORDS[0]}),
+                args.requests,
+                args.rounds,
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(f'comments on page: {args.comments}, requests: {args.requests}')
+    print(f'GET detail:          {get:.0f} req/s')
+    print(f'POST rejected form:  {rejected:.0f} req/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Сравнение проверки запрещённых слов: цикл по словам и автомат.
+
+Запуск из каталога ya_news:
+
+    python -m benchmarks.bench_moderation --words 5000 --text-kb 4
+"""
+import argparse
+import random
+import timeit
+
+from news.moderation import AhoCorasick
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+def random_word(rng, length):
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def loop_search(words, text):
+    """Прежняя проверка из CommentForm.clean_text."""
+    for word in words:
+        if word in text:
+            return word
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=5000)
+    parser.add_argument('--text-kb', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = [random_word(rng, rng.randint(5, 9)) for _ in range(args.words)]
+    text = ' '.join(
+        random_word(rng, rng.randint(2, 8))
+        for _ in range(args.text_kb * 1024 // 6)
+    )[:args.text_kb * 1024]
+
+    build = timeit.timeit(lambda: AhoCorasick(words), number=1)
+    matcher = AhoCorasick(words)
+    # Чистый текст — худший случай для цикла: проверяются все слова.
+    loop = timeit.timeit(
+        lambda: loop_search(words, text), number=args.repeat
+    ) / args.repeat
+    automaton = timeit.timeit(
+        lambda: list(matcher.finditer(text)), number=args.repeat
+    ) / args.repeat
+
+    print(f'words: {args.words}, text: {len(text)} chars')
+    print(f'automaton build: {build * 1000:.1f} ms (once per word list)')
+    print(f'loop:      {loop * 1000:.3f} ms per comment')
+    print(f'automaton: {automaton * 1000:.3f} ms per comment')
+    print(f'speedup:   {loop / automaton:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
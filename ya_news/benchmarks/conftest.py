@@ -0,0 +1,32 @@
+import pytest
+from django.core.cache import cache
+from django.test.client import Client
+
+from yanews.pytest_bench import (  # noqa: F401
+    benchmark,
+    pytest_addoption,
+    pytest_sessionfinish,
+)
+
+
+@pytest.fixture(autouse=True)
+def production(settings):
+    """Условия работы: без ограничения частоты и без старого кэша."""
+    settings.DEBUG = False
+    settings.RATE_LIMITS = {}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def reader(django_user_model):
+    return django_user_model.objects.create(username='reader')
+
+
+@pytest.fixture
+def reader_client(reader):
+    """Авторизованный читатель: его страницы не берутся из кэша ленты."""
+    client = Client()
+    client.force_login(reader)
+    return client
@@ -0,0 +1,63 @@
+"""
+Замеры горячих путей YaNews через тестовый клиент.
+
+Запускаются отдельно от проверок корректности:
+
+    pytest benchmarks
+"""
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.urls import reverse
+
+from news.models import Comment, News, summarize
+
+COMMENTS_ON_DETAIL = 1000
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def news_feed():
+    text = 'Текст новости. ' * 30
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text=text, summary=summarize(text))
+        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE * 3)
+    )
+
+
+@pytest.fixture
+def discussed_news(reader):
+    news = News.objects.create(title='Обсуждаемая', text='Текст новости.')
+    Comment.objects.bulk_create(
+        Comment(news=news, author=reader, text=f'Комментарий {index}')
+        for index in range(COMMENTS_ON_DETAIL)
+    )
+    News.recount_comments()
+    return news
+
+
+def test_home(benchmark, reader_client, news_feed):
+    url = reverse('news:home')
+    response = benchmark(reader_client.get, url)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_home_cached(benchmark, client, news_feed):
+    url = reverse('news:home')
+    response = benchmark(client.get, url)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_detail_1k_comments(benchmark, reader_client, discussed_news):
+    url = reverse('news:detail', args=(discussed_news.pk,))
+    response = benchmark(reader_client.get, url)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_comment_post(benchmark, reader_client, discussed_news):
+    url = reverse('news:detail', args=(discussed_news.pk,))
+    data = {'text': 'Новый комментарий'}
+    response = benchmark(reader_client.post, url, data)
+    assert response.status_code == HTTPStatus.FOUND
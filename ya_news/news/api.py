@@ -0,0 +1,170 @@
+"""
+Версионированный JSON API только для чтения: `/api/v1/`.
+
+Ответы собираются из `values()`, без создания экземпляров моделей
+и без шаблонов. Параметр `?fields=id,title` оставляет в ответе только
+нужные поля, и в SELECT попадают только они и ключи пагинации.
+Списки листаются курсором `?cursor=` на тех же ключах, что и
+HTML-страницы.
+
+ETag строится по версии данных ленты (см. `news/cache.py`) и адресу
+запроса, поэтому повторный запрос с `If-None-Match` получает
+`304 Not Modified`, не обращаясь к базе.
+"""
+from abc import ABCMeta, abstractmethod
+
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import generic
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .cache import api_etag
+from .models import Comment, News
+from .pagination import KeysetPaginator
+
+revalidate_public = (
+    cache_control(public=True, no_cache=True),
+    condition(etag_func=api_etag),
+)
+
+
+class FieldsError(ValueError):
+    """В `?fields=` запрошено неизвестное поле."""
+
+
+def parse_fields(value, available, default):
+    """Имена полей из `?fields=` в порядке запроса."""
+    if not value:
+        return default
+    fields = tuple(dict.fromkeys(
+        name.strip() for name in value.split(',') if name.strip()
+    ))
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise FieldsError(
+            'Неизвестные поля: {}. Доступны: {}.'.format(
+                ', '.join(unknown), ', '.join(available)
+            )
+        )
+    return fields or default
+
+
+@method_decorator(revalidate_public, name='get')
+class ApiView(generic.View, metaclass=ABCMeta):
+    """
+    Основа ресурсов API.
+
+    `fields` сопоставляет имена полей в ответе с выражениями
+    для `values()`, `default_fields` отдаются без `?fields=`.
+    Подкласс обязан определить `get_data()`.
+    """
+    fields = {}
+    default_fields = ()
+
+    def get(self, request, *args, **kwargs):
+        try:
+            self.selected = parse_fields(
+                request.GET.get('fields'), self.fields, self.default_fields
+            )
+            data = self.get_data()
+        except FieldsError as error:
+            return JsonResponse({'errors': [str(error)]}, status=400)
+        except Http404 as error:
+            return JsonResponse({'errors': [str(error)]}, status=404)
+        return JsonResponse(data, json_dumps_params={'ensure_ascii': False})
+
+    def lookups(self, extra=()):
+        """Выражения для `values()`: выбранные поля и `extra`."""
+        return tuple(dict.fromkeys(
+            [self.fields[name] for name in self.selected] + list(extra)
+        ))
+
+    def serialize(self, row):
+        return {name: row[self.fields[name]] for name in self.selected}
+
+    @abstractmethod
+    def get_data(self):
+        """Тело ответа: словарь для `JsonResponse`."""
+
+
+class ApiListView(ApiView):
+    """
+    Список ресурса с курсорной пагинацией по `keys`.
+
+    Подкласс обязан определить `get_queryset()`.
+    """
+    keys = ()
+    cursor_param = 'cursor'
+
+    @abstractmethod
+    def get_queryset(self):
+        """Строки ресурса; поля для `values()` выбирает `get_data()`."""
+
+    def get_data(self):
+        key_fields = [key.lstrip('-') for key in self.keys]
+        page = KeysetPaginator(
+            self.get_queryset().values(*self.lookups(extra=key_fields)),
+            keys=self.keys,
+            per_page=settings.API_PAGE_SIZE,
+        ).page(self.request.GET.get(self.cursor_param))
+        return {
+            'results': [self.serialize(row) for row in page.object_list],
+            'next_cursor': page.next_cursor,
+        }
+
+
+NEWS_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'date': 'date',
+    'comment_count': 'comment_count',
+}
+
+COMMENT_FIELDS = {
+    'id': 'id',
+    'news': 'news_id',
+    'author': 'author__username',
+    'text': 'text',
+    'created': 'created',
+}
+
+
+class NewsListApi(ApiListView):
+    """Лента новостей, от новых к старым."""
+    fields = NEWS_FIELDS
+    default_fields = ('id', 'title', 'date', 'comment_count')
+    keys = ('-date', 'id')
+
+    def get_queryset(self):
+        return News.objects.all()
+
+
+class NewsDetailApi(ApiView):
+    """Одна новость."""
+    fields = NEWS_FIELDS
+    default_fields = tuple(NEWS_FIELDS)
+
+    def get_data(self):
+        row = News.objects.filter(pk=self.kwargs['pk']).values(
+            *self.lookups()
+        ).first()
+        if row is None:
+            raise Http404('Новость не найдена.')
+        return self.serialize(row)
+
+
+class CommentListApi(ApiListView):
+    """Одобренные комментарии новости, от старых к новым."""
+    fields = COMMENT_FIELDS
+    default_fields = ('id', 'author', 'text', 'created')
+    keys = ('created', 'id')
+
+    def get_queryset(self):
+        if not News.objects.filter(pk=self.kwargs['pk']).exists():
+            raise Http404('Новость не найдена.')
+        return Comment.objects.filter(
+            news_id=self.kwargs['pk'], status=Comment.Status.APPROVED
+        )
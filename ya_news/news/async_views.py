@@ -0,0 +1,146 @@
+"""
+Асинхронные версии страниц чтения для ASGI-профиля.
+
+Логику страниц не дублируем: запросы к базе и кэшу выполняют те же
+классы `NewsList` и `NewsDetail`, но все обращения одной страницы
+собраны в одну функцию и выполняются одним переходом
+`sync_to_async(thread_sensitive=True)`. Сессия и пользователь
+загружаются там же, поэтому шаблон рисуется уже в цикле событий
+и к базе не обращается. Пока страница ждёт базу или медленного
+клиента, рабочий процесс обслуживает остальные соединения и не
+держит под каждое свой поток.
+
+Декоратор `condition` в Django 3.2 не работает с корутинами,
+поэтому условные GET-запросы обрабатываются здесь явно.
+"""
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotAllowed
+from django.template.response import TemplateResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+
+from yanews.replicas import read_from_primary
+
+from .cache import (
+    home_page_etag,
+    home_page_key,
+    news_detail_etag,
+    news_detail_last_modified,
+)
+from .views import NewsDetail, NewsList
+
+# Результат синхронной части: готовый ответ (304 или страница из кэша)
+# либо контекст для шаблона.
+Prepared = namedtuple(
+    'Prepared', ('etag', 'last_modified', 'response', 'context', 'cache_key')
+)
+
+news_detail_sync = NewsDetail.as_view()
+
+
+def _prepare(view_class, request, **kwargs):
+    view = view_class()
+    view.setup(request, **kwargs)
+    # Загружаем сессию и пользователя здесь, а не при рендеринге.
+    request.user.is_authenticated
+    return view
+
+
+def _finish(request, template_name, prepared):
+    """Рисует страницу и ставит заголовки `revalidate` и `condition`."""
+    response = prepared.response
+    if response is None:
+        response = TemplateResponse(request, template_name, prepared.context)
+        response.render()
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Cookie',))
+    if prepared.etag is not None:
+        response['ETag'] = quote_etag(prepared.etag)
+    if prepared.last_modified is not None:
+        response['Last-Modified'] = http_date(
+            prepared.last_modified.timestamp()
+        )
+    return response
+
+
+@sync_to_async(thread_sensitive=True)
+def _home_page(request):
+    """Всё, что главной нужно от базы и кэша, за один переход."""
+    view = _prepare(NewsList, request)
+    etag = home_page_etag(request)
+    if etag is not None:
+        response = get_conditional_response(request, etag=quote_etag(etag))
+        if response is not None:
+            return Prepared(etag, None, response, None, None)
+    if request.user.is_authenticated:
+        view.object_list = view.get_queryset()
+        return Prepared(etag, None, None, view.get_context_data(), None)
+    key = home_page_key(request.GET.get(view.cursor_param))
+    content = cache.get(key)
+    if content is not None:
+        return Prepared(etag, None, HttpResponse(content), None, None)
+    # Как в `NewsList.get`: под ключом версии — только основная база.
+    with read_from_primary():
+        view.object_list = view.get_queryset()
+        context = view.get_context_data()
+    return Prepared(etag, None, None, context, key)
+
+
+async def news_list(request):
+    """Асинхронная версия `NewsList`."""
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(('GET', 'HEAD'))
+    prepared = await _home_page(request)
+    response = _finish(request, NewsList.template_name, prepared)
+    if prepared.cache_key is not None:
+        await sync_to_async(cache.set)(
+            prepared.cache_key,
+            response.content,
+            settings.NEWS_HOME_CACHE_TIMEOUT,
+        )
+    return response
+
+
+news_list.replica_reads = NewsList.replica_reads
+
+
+@sync_to_async(thread_sensitive=True)
+def _detail_page(request, pk):
+    """Всё, что странице новости нужно от базы, за один переход."""
+    view = _prepare(NewsDetail, request, pk=pk)
+    etag = news_detail_etag(request, pk)
+    last_modified = news_detail_last_modified(request, pk)
+    if etag is not None:
+        response = get_conditional_response(
+            request,
+            etag=quote_etag(etag),
+            last_modified=int(last_modified.timestamp()),
+        )
+        if response is not None:
+            return Prepared(etag, last_modified, response, None, None)
+    view.object = view.get_object()
+    context = view.get_context_data(object=view.object)
+    return Prepared(etag, last_modified, None, context, None)
+
+
+async def news_detail(request, pk):
+    """
+    Асинхронная версия `NewsDetail` для GET.
+
+    Отправку комментария обслуживает синхронное представление.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return await sync_to_async(news_detail_sync)(request, pk=pk)
+    prepared = await _detail_page(request, pk)
+    return _finish(request, NewsDetail.template_name, prepared)
+
+
+news_detail.replica_reads = NewsDetail.replica_reads
@@ -0,0 +1,129 @@
+"""
+Кэш отрисованных страниц ленты новостей и условные GET-запросы.
+
+Ключи страниц включают номер версии данных. Любое изменение новости
+или комментария увеличивает версию (см. `news/signals.py`), и старые
+страницы просто перестают читаться, а затем вытесняются бэкендом.
+Версия растёт и сразу, и после фиксации транзакции с изменением.
+Та же версия входит в ETag страниц, поэтому браузер с актуальной
+копией получает `304 Not Modified` без обращения к шаблонам.
+"""
+import hashlib
+import time
+from datetime import datetime, time as day_start
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from yanews.replicas import reads_from_replica
+
+from .models import Comment, News
+
+VERSION_KEY = 'news:version'
+
+
+def get_version():
+    """Текущая версия данных ленты."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Начинаем с текущего времени, а не с единицы: если ключ версии
+        # вытеснят, новая версия не совпадёт ни с одной из прежних.
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    """Делает устаревшими все закэшированные страницы ленты."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        get_version()
+
+
+def forget_news_pages():
+    """
+    Сбрасывает страницы ленты сейчас и ещё раз после фиксации.
+
+    Сигналы срабатывают внутри транзакции: страница, собранная
+    до фиксации по старым данным, иначе осталась бы в кэше
+    под новой версией.
+    """
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def home_page_key(cursor=None):
+    """Ключ страницы ленты для текущей версии и курсора."""
+    digest = hashlib.md5((cursor or '').encode()).hexdigest()
+    return f'news:home:{get_version()}:{digest}'
+
+
+def _make_etag(*parts):
+    return hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+
+
+def home_page_etag(request, *args, **kwargs):
+    """
+    Значение ETag главной: версия данных, читатель и курсор.
+
+    Страница читателя, которую отрисует отстающая реплика, может
+    не соответствовать версии, поэтому ETag у неё нет. Анонимная
+    страница всегда читается с основной базы.
+    """
+    if request.user.is_authenticated and reads_from_replica():
+        return None
+    return _make_etag(
+        get_version(), request.user.pk, request.GET.get('cursor', '')
+    )
+
+
+def api_etag(request, *args, **kwargs):
+    """
+    Значение ETag ответа API: версия данных и адрес с параметрами.
+
+    Ответы API не зависят от читателя, поэтому пользователь в ETag
+    не входит, а проверка не обращается к базе.
+    """
+    return _make_etag(get_version(), request.get_full_path())
+
+
+def news_detail_state(request, pk):
+    """
+    Дата новости, время последнего одобренного комментария и их число.
+
+    Читаются одним агрегатным запросом и запоминаются на запросе,
+    чтобы ETag и Last-Modified не выполняли его дважды.
+    """
+    if not hasattr(request, 'news_detail_state'):
+        request.news_detail_state = News.objects.filter(pk=pk).annotate(
+            last_comment=Max(
+                'comment__created',
+                filter=Q(comment__status=Comment.Status.APPROVED),
+            )
+        ).values_list('date', 'last_comment', 'comment_count').first()
+    return request.news_detail_state
+
+
+def news_detail_etag(request, pk):
+    """Значение ETag страницы новости; `None`, если новости нет."""
+    state = news_detail_state(request, pk)
+    if state is None:
+        return None
+    return _make_etag(
+        get_version(), request.user.pk, request.GET.get('cursor', ''), *state
+    )
+
+
+def news_detail_last_modified(request, pk):
+    """Время последнего изменения новости или её обсуждения."""
+    state = news_detail_state(request, pk)
+    if state is None:
+        return None
+    date, last_comment, _ = state
+    modified = timezone.make_aware(datetime.combine(date, day_start.min))
+    if last_comment is not None:
+        modified = max(modified, last_comment)
+    return modified
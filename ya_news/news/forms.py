@@ -1,12 +1,18 @@
+import logging
+
 from django.forms import ModelForm
 from django.core.exceptions import ValidationError
 
 from .models import Comment
+from .moderation import get_matcher
+
+logger = logging.getLogger(__name__)
 
 BAD_WORDS = (
     'редиска',
     'негодяй',
     # Дополните список на своё усмотрение.
+    # Остальные слова модераторы добавляют в админке (BannedWord).
 )
 WARNING = 'Не ругайтесь!'
 
@@ -18,10 +24,17 @@ class CommentForm(ModelForm):
         fields = ('text',)
 
     def clean_text(self):
-        """Не позволяем ругаться в комментариях."""
+        """
+        Не позволяем ругаться в комментариях.
+
+        Найденные слова и их позиции сохраняются в `bad_word_matches`
+        и пишутся в лог, чтобы модераторы видели, что сработало.
+        """
         text = self.cleaned_data['text']
-        lowered_text = text.lower()
-        for word in BAD_WORDS:
-            if word in lowered_text:
-                raise ValidationError(WARNING)
+        self.bad_word_matches = list(
+            get_matcher(defaults=BAD_WORDS).finditer(text.lower())
+        )
+        if self.bad_word_matches:
+            logger.info('Comment rejected: %s', self.bad_word_matches)
+            raise ValidationError(WARNING)
         return text
@@ -0,0 +1,203 @@
+import random
+from datetime import date, timedelta
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from news.cache import bump_version
+from news.models import Comment, News, summarize
+
+USER_PREFIX = 'load_'
+
+SYLLABLES = (
+    'ва', 'ло', 'ми', 'ра', 'те', 'но', 'ки', 'су', 'да', 'пе', 'ро', 'жи',
+    'ла', 'ны', 'го', 'бе', 'ст', 'ко', 'ре', 'ти',
+)
+
+
+def make_word(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_text(rng, words):
+    return ' '.join(make_word(rng) for _ in range(words)).capitalize() + '.'
+
+
+def heavy_tailed_counts(rng, size, total, alpha):
+    """
+    Делит `total` на `size` частей с распределением Парето.
+
+    Большинству достаётся немного, единицам — очень много:
+    так распределены комментарии к новостям в жизни.
+    """
+    weights = [rng.paretovariate(alpha) for _ in range(size)]
+    scale = total / sum(weights)
+    return [int(weight * scale) for weight in weights]
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def next_user_number():
+    """Номер, с которого продолжаются имена `load_N`."""
+    names = get_user_model().objects.filter(
+        username__regex=rf'^{USER_PREFIX}[0-9]+$'
+    ).values_list('username', flat=True)
+    return max(
+        (int(name[len(USER_PREFIX):]) for name in names), default=-1
+    ) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу пользователями, новостями и комментариями '
+        'для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--news', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument(
+            '--alpha',
+            type=float,
+            default=1.2,
+            help='Параметр Парето: чем меньше, тем тяжелее хвост.',
+        )
+        parser.add_argument(
+            '--pending-share',
+            type=float,
+            default=0.02,
+            help='Доля комментариев, ждущих модерации.',
+        )
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--password', default='load-password')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        # Одна транзакция: прерванный запуск не оставляет половины данных.
+        with transaction.atomic():
+            user_ids = self.create_users(
+                options['users'], options['password']
+            )
+            last_news_id = self.last_pk(News)
+            news_ids = self.create_news(options['news'], options['days'])
+            self.create_comments(
+                news_ids,
+                user_ids,
+                options['comments'],
+                options['alpha'],
+                options['pending_share'],
+            )
+            News.recount_comments(News.objects.filter(pk__gt=last_news_id))
+        bump_version()
+        self.stdout.write(self.style.SUCCESS('Готово.'))
+
+    @staticmethod
+    def last_pk(model):
+        return model.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+
+    def insert(self, model, objects):
+        """Вставляет порциями; возвращает число строк."""
+        created = 0
+        for chunk in chunks(objects, self.batch_size):
+            model.objects.bulk_create(chunk)
+            created += len(chunk)
+        return created
+
+    def insert_returning_ids(self, model, objects):
+        """
+        Вставляет строки и возвращает их первичные ключи.
+
+        `bulk_create` на SQLite ключей не возвращает, а новые строки
+        одной транзакции получают ключи подряд после последнего.
+        """
+        last_pk = self.last_pk(model)
+        self.insert(model, objects)
+        return list(
+            model.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk', flat=True
+            )
+        )
+
+    def create_users(self, count, password):
+        User = get_user_model()
+        start = next_user_number()
+        # Хэш считается один раз: он медленный намеренно.
+        password = make_password(password)
+        ids = self.insert_returning_ids(User, (
+            User(username=f'{USER_PREFIX}{start + i}', password=password)
+            for i in range(count)
+        ))
+        self.stdout.write(
+            f'Пользователи: {len(ids)} ({USER_PREFIX}{start}…'
+            f'{USER_PREFIX}{start + count - 1}); для load_driver.py: '
+            f'--first-user {start} --users {count}'
+        )
+        return ids
+
+    def create_news(self, count, days):
+        today = date.today()
+
+        def news():
+            for _ in range(count):
+                text = ' '.join(
+                    make_text(self.rng, self.rng.randint(5, 15))
+                    for _ in range(self.rng.randint(2, 8))
+                )
+                # `bulk_create` не вызывает `save()`, заполняющий анонс.
+                yield News(
+                    title=make_text(self.rng, self.rng.randint(2, 5))[:50],
+                    text=text,
+                    summary=summarize(text),
+                    date=today - timedelta(days=self.rng.randint(0, days)),
+                )
+
+        ids = self.insert_returning_ids(News, news())
+        self.stdout.write(f'Новости: {len(ids)}')
+        return ids
+
+    def create_comments(self, news_ids, user_ids, total, alpha, pending):
+        counts = heavy_tailed_counts(self.rng, len(news_ids), total, alpha)
+        # Пишут тоже неравномерно: у активных читателей больший вес.
+        author_weights = list(accumulate(
+            self.rng.paretovariate(alpha) for _ in user_ids
+        ))
+
+        def comments():
+            for news_id, count in zip(news_ids, counts):
+                authors = self.rng.choices(
+                    user_ids, cum_weights=author_weights, k=count
+                )
+                for author_id in authors:
+                    status = (
+                        Comment.Status.PENDING
+                        if self.rng.random() < pending
+                        else Comment.Status.APPROVED
+                    )
+                    yield Comment(
+                        news_id=news_id,
+                        author_id=author_id,
+                        text=make_text(self.rng, self.rng.randint(3, 30)),
+                        status=status,
+                    )
+
+        created = self.insert(Comment, comments())
+        self.stdout.write(
+            f'Комментарии: {created}, больше всего у одной новости: '
+            f'{max(counts, default=0)}'
+        )
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from news.queue import process_batch
+
+
+class Command(BaseCommand):
+    help = 'Проверяет комментарии из очереди модерации.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Сколько комментариев проверять в одной транзакции.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Разобрать текущую очередь и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        approved = rejected = 0
+        while True:
+            batch = process_batch(options['batch_size'])
+            approved += batch[0]
+            rejected += batch[1]
+            if any(batch):
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Одобрено: {approved}, отклонено: {rejected}'
+        ))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from news.cache import bump_version
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает денормализованные счётчики комментариев новостей.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько новостей обновлять одним запросом.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ids = News.objects.order_by('pk').values_list('pk', flat=True)
+        updated = 0
+        last_id = 0
+        while True:
+            batch = list(ids.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            updated += News.recount_comments(
+                News.objects.filter(pk__in=batch)
+            )
+            last_id = batch[-1]
+        bump_version()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено счётчиков: {updated}')
+        )
@@ -0,0 +1,95 @@
+# Generated by Django 3.2.15 on 2026-10-18 03:39
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+BATCH_SIZE = 1000
+# Копия `news.models.summarize` на момент миграции: дальнейшие
+# изменения модели не должны менять уже применённую миграцию.
+SUMMARY_WORDS = 15
+
+
+def fill_summary(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    last_pk = 0
+    while True:
+        batch = list(
+            News.objects.filter(pk__gt=last_pk).order_by('pk').only(
+                'text'
+            )[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        for news in batch:
+            news.summary = Truncator(news.text).words(
+                SUMMARY_WORDS, truncate=' …'
+            )
+        News.objects.bulk_update(batch, ['summary'])
+        last_pk = batch[-1].pk
+
+
+# Копия DDL из 0004_news_fts: пересоздание таблицы теряет триггеры.
+FTS_TABLE = 'news_news_fts'
+
+INSTALL_SQL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, text,
+        content='news_news', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON news_news BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON news_news BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF title, text ON news_news BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+
+
+def install_index(apps, schema_editor):
+    """Создаёт заново триггеры индекса и перестраивает индекс."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in INSTALL_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_comment_status'),
+    ]
+
+    # SQLite пересоздаёт таблицу новостей и при добавлении столбца,
+    # и при удалении, теряя триггеры поиска: восстанавливаем их
+    # после каждого изменения.
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, install_index),
+        migrations.AddField(
+            model_name='news',
+            name='summary',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(fill_summary, migrations.RunPython.noop),
+        migrations.RunPython(install_index, migrations.RunPython.noop),
+    ]
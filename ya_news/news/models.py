@@ -2,26 +2,88 @@ from datetime import datetime
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.text import Truncator
+
+SUMMARY_WORDS = 15
+
+
+def summarize(text):
+    """Анонс для ленты: то же, что `text|truncatewords:15`."""
+    return Truncator(text).words(SUMMARY_WORDS, truncate=' …')
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
+    # Лента показывает анонс и не читает из базы полный текст.
+    # Заполняется в `save()`; `bulk_create` и `update()` его не трогают.
+    summary = models.TextField(default='', editable=False)
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('-date', 'id'), name='news_date_id_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.summary = summarize(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'summary'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def change_comment_count(cls, news_id, delta):
+        """
+        Атомарно сдвигает счётчик комментариев новости на `delta`.
+
+        Счётчик учитывает только одобренные комментарии.
+        """
+        cls.objects.filter(pk=news_id).update(
+            comment_count=F('comment_count') + delta
+        )
+
+    @classmethod
+    def recount_comments(cls, queryset=None):
+        """
+        Пересчитывает счётчики одобренных комментариев одним UPDATE.
+
+        Если `queryset` не передан, обновляются все новости.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        counts = Comment.objects.filter(
+            news=OuterRef('pk'), status=Comment.Status.APPROVED
+        ).order_by().values('news').annotate(
+            total=Count('pk')
+        ).values('total')
+        return queryset.order_by().update(
+            comment_count=Coalesce(Subquery(counts), 0)
+        )
+
 
 class Comment(models.Model):
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'На модерации'
+        APPROVED = 'approved', 'Одобрен'
+        REJECTED = 'rejected', 'Отклонён'
+
     news = models.ForeignKey(
         News,
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        # Поиск по новости обслуживает составной индекс
+        # (news_id, status, created).
+        db_index=False,
     )
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -29,9 +91,46 @@ class Comment(models.Model):
     )
     text = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
+    # Комментарии, созданные в обход формы (админка, фикстуры),
+    # считаются одобренными; форма на сайте отправляет их в очередь.
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=Status.choices,
+        default=Status.APPROVED,
+    )
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'status', 'created'),
+                name='comment_news_status_idx',
+            ),
+            # Очередь модерации: маленький частичный индекс только
+            # по ожидающим проверки комментариям.
+            models.Index(
+                fields=('id',),
+                condition=models.Q(status='pending'),
+                name='comment_pending_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+
+class BannedWord(models.Model):
+    word = models.CharField('Слово', max_length=100, unique=True)
+
+    class Meta:
+        ordering = ('word',)
+        verbose_name_plural = 'Запрещённые слова'
+        verbose_name = 'Запрещённое слово'
+
+    def __str__(self):
+        return self.word
+
+    def save(self, *args, **kwargs):
+        self.word = self.word.strip().lower()
+        super().save(*args, **kwargs)
@@ -0,0 +1,116 @@
+"""
+Поиск запрещённых слов в комментариях.
+
+Вместо проверки каждого слова отдельной подстрокой (время растёт как
+«число слов × длина текста») строится автомат Ахо — Корасик: он
+находит все вхождения всех слов за один проход по тексту.
+
+Словарь хранится в модели `BannedWord` и правится в админке. Каждый
+процесс держит собранный автомат в памяти и сверяет только номер
+версии словаря в кэше: после фиксации изменения словаря версия
+меняется, и процессы пересобирают автомат при следующей проверке.
+Чтобы изменения видели все процессы, кэш должен быть общим
+(не `LocMemCache`).
+"""
+import time
+from collections import deque, namedtuple
+
+from django.core.cache import cache
+
+Match = namedtuple('Match', ('start', 'end', 'word'))
+Compiled = namedtuple('Compiled', ('version', 'defaults', 'matcher'))
+
+VERSION_KEY = 'news:banned_words:version'
+
+_compiled = Compiled(None, None, None)
+
+
+class AhoCorasick:
+    """Автомат Ахо — Корасик над набором слов."""
+
+    def __init__(self, words):
+        self.words = tuple(words)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for word in self.words:
+            if word:
+                self._add(word)
+        self._link()
+
+    def _add(self, word):
+        node = 0
+        for char in word:
+            following = self._goto[node].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[node][char] = following
+            node = following
+        self._output[node] += (word,)
+
+    def _link(self):
+        """Проставляет переходы по неудаче обходом бора в ширину."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def finditer(self, text):
+        """Все вхождения слов в текст с позициями, в порядке окончания."""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for word in output[node]:
+                yield Match(position - len(word) + 1, position + 1, word)
+
+    def search(self, text):
+        """Первое найденное вхождение или `None`."""
+        return next(self.finditer(text), None)
+
+
+def bump_version():
+    """Сообщает всем процессам, что словарь изменился."""
+    cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_matcher(defaults=()):
+    """
+    Автомат для слов из `defaults` и из словаря в базе.
+
+    Пока версия словаря в кэше не меняется, база не читается:
+    проверка комментария стоит одного обращения к кэшу.
+    """
+    global _compiled
+    version = get_version()
+    if _compiled.version != version or _compiled.defaults != defaults:
+        from .models import BannedWord
+
+        words = set(defaults) | set(
+            BannedWord.objects.values_list('word', flat=True)
+        )
+        _compiled = Compiled(
+            version,
+            defaults,
+            AhoCorasick(sorted(word.lower() for word in words)),
+        )
+    return _compiled.matcher
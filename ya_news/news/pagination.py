@@ -0,0 +1,98 @@
+import base64
+import binascii
+import json
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+KeysetPage = namedtuple('KeysetPage', ('object_list', 'next_cursor'))
+
+
+class KeysetPaginator:
+    """
+    Постраничный вывод по ключу (keyset/cursor pagination).
+
+    В отличие от OFFSET, стоимость выборки любой страницы не зависит
+    от её номера: следующая страница начинается строго после последней
+    записи предыдущей, что позволяет базе идти по индексу.
+    Ключи задаются как в `order_by`: `('-date', 'id')`.
+    Последний ключ должен быть уникальным, обычно это `id`.
+    """
+
+    def __init__(self, queryset, keys, per_page):
+        self.queryset = queryset
+        self.keys = tuple(keys)
+        self.per_page = per_page
+        self.fields = [key.lstrip('-') for key in self.keys]
+
+    def _key_values(self, obj):
+        """Значения ключей записи: модели или словаря из `values()`."""
+        if isinstance(obj, dict):
+            return [obj[name] for name in self.fields]
+        return [getattr(obj, name) for name in self.fields]
+
+    def encode_cursor(self, obj):
+        """Строит курсор по значениям ключей записи или словаря."""
+        values = [
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in self._key_values(obj)
+        ]
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Разбирает курсор; на испорченный курсор отвечаем 404."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise Http404('Некорректный курсор.')
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise Http404('Некорректный курсор.')
+        model = self.queryset.model
+        try:
+            return [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except ValidationError:
+            raise Http404('Некорректный курсор.')
+
+    def _after(self, values):
+        """
+        Условие «строго после курсора» с учётом направления ключей.
+
+        Дополнительная граница по первому ключу не меняет результат,
+        но позволяет базе начать поиск по индексу прямо с курсора,
+        а не просматривать индекс с начала.
+        """
+        condition = Q()
+        for position in reversed(range(len(self.keys))):
+            name = self.fields[position]
+            lookup = 'lt' if self.keys[position].startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[position]})
+            if position < len(self.keys) - 1:
+                step |= Q(**{name: values[position]}) & condition
+            condition = step
+        lookup = 'lte' if self.keys[0].startswith('-') else 'gte'
+        return Q(**{f'{self.fields[0]}__{lookup}': values[0]}) & condition
+
+    def page(self, cursor=None):
+        """
+        Возвращает страницу, начинающуюся после `cursor`.
+
+        Выбирается на одну запись больше страницы: если она нашлась,
+        следующая страница есть. Так хватает одного запроса.
+        """
+        queryset = self.queryset.order_by(*self.keys)
+        if cursor:
+            queryset = queryset.filter(self._after(self.decode_cursor(cursor)))
+        rows = list(queryset[:self.per_page + 1])
+        object_list = rows[:self.per_page]
+        next_cursor = None
+        if len(rows) > self.per_page:
+            next_cursor = self.encode_cursor(object_list[-1])
+        return KeysetPage(object_list, next_cursor)
@@ -1,11 +1,69 @@
 from datetime import datetime
 
 import pytest
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.test.client import Client
 from django.urls import reverse
 from django.conf import settings
 
 from news.models import News, Comment
+from yanews.auth import user_cache
+from yanews.pytest_budget import view_stats  # noqa: F401
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Очищает кэш и кэш пользователей, чтобы страницы и пользователи
+    не переходили между тестами.
+    """
+    cache.clear()
+    user_cache.clear()
+    yield
+    cache.clear()
+    user_cache.clear()
+
+
+@pytest.fixture(
+    params=(
+        'django.core.cache.backends.locmem.LocMemCache',
+        'django.core.cache.backends.filebased.FileBasedCache',
+    ),
+    ids=('locmem', 'filebased'),
+)
+def cache_backend(request, settings, tmp_path):
+    """Подменяет кэш на локальный в памяти или файловый."""
+    settings.CACHES = {
+        'default': {'BACKEND': request.param, 'LOCATION': str(tmp_path)}
+    }
+    return request.param
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """
+    Делает реплику отдельным файлом SQLite — снимком основной базы.
+
+    Возвращает функцию `replicate()`, которая обновляет снимок:
+    до её вызова реплика отстаёт от основной базы. Тесту нужен
+    маркер `django_db(transaction=True, databases=...)` с обеими базами.
+    """
+    primary = connections[DEFAULT_DB_ALIAS]
+    copy = connections[settings.REPLICA_DATABASE]
+    mirror_name = copy.settings_dict['NAME']
+    copy.close()
+    copy.settings_dict['NAME'] = str(tmp_path / 'replica.sqlite3')
+
+    def replicate():
+        primary.ensure_connection()
+        copy.ensure_connection()
+        primary.connection.backup(copy.connection)
+
+    replicate()
+    yield replicate
+    copy.close()
+    copy.settings_dict['NAME'] = mirror_name
 
 
 @pytest.fixture
@@ -107,6 +165,22 @@ def multiple_comments(news_author, single_news_item):
         )
 
 
+@pytest.fixture
+def paginated_comments(news_author, single_news_item):
+    """
+    Создает комментариев на пять больше, чем помещается на одной
+    странице новости, чтобы проверить подгрузку по курсору.
+    """
+    Comment.objects.bulk_create(
+        Comment(
+            news=single_news_item,
+            author=news_author,
+            text=f'Paged comment {i}'
+        )
+        for i in range(settings.COMMENTS_COUNT_ON_PAGE + 5)
+    )
+
+
 @pytest.fixture
 def news_item_id(single_news_item):
     """
@@ -140,6 +214,36 @@ def home_url():
     return reverse('news:home')
 
 
+@pytest.fixture
+def news_feed_url():
+    """Возвращает URL NDJSON-ленты новостей."""
+    return reverse('news:feed')
+
+
+@pytest.fixture
+def search_url():
+    """Возвращает URL поиска по новостям."""
+    return reverse('news:search')
+
+
+@pytest.fixture
+def api_news_url():
+    """Возвращает URL ленты новостей в JSON API."""
+    return reverse('news:api-news')
+
+
+@pytest.fixture
+def api_news_detail_url(single_news_item):
+    """Возвращает URL новости в JSON API."""
+    return reverse('news:api-news-detail', args=[single_news_item.pk])
+
+
+@pytest.fixture
+def api_comments_url(single_news_item):
+    """Возвращает URL комментариев к новости в JSON API."""
+    return reverse('news:api-comments', args=[single_news_item.pk])
+
+
 @pytest.fixture
 def news_detail_url(news_item_id):
     """Возвращает URL страницы детали конкретной новости по `news_item_id`."""
@@ -164,6 +268,12 @@ def single_news_detail_url(single_news_item):
     return reverse('news:detail', args=[single_news_item.pk])
 
 
+@pytest.fixture
+def news_comments_url(single_news_item):
+    """Возвращает URL подгрузки комментариев к новости."""
+    return reverse('news:comments', args=[single_news_item.pk])
+
+
 @pytest.fixture
 def delete_comment_url(single_comment):
     """Возвращает URL страницы удаления конкретного комментария."""
@@ -0,0 +1,191 @@
+import asyncio
+import threading
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import AsyncClient
+
+from news.models import Comment
+from yanews import settings_asgi
+from yanews.replicas import ReplicaMiddleware
+
+
+@pytest.fixture
+def asgi_profile(settings):
+    """Переключает адреса и middleware на ASGI-профиль."""
+    settings.ROOT_URLCONF = settings_asgi.ROOT_URLCONF
+    settings.MIDDLEWARE = settings_asgi.MIDDLEWARE
+
+
+@pytest.fixture
+def async_client():
+    return AsyncClient()
+
+
+@pytest.fixture
+def async_reader_client(regular_user):
+    client = AsyncClient()
+    client.force_login(regular_user)
+    return client
+
+
+def fetch(client, *args, method='get', **kwargs):
+    """Синхронно выполняет запрос асинхронного клиента."""
+    async def send():
+        return await getattr(client, method)(*args, **kwargs)
+    return async_to_sync(send)()
+
+
+@pytest.mark.django_db
+def test_async_home_page(
+        asgi_profile,
+        async_client,
+        multiple_news_items,
+        home_url,
+        django_assert_num_queries
+):
+    """
+    Проверяет, что асинхронная главная выводит ленту, кладёт её
+    в кэш для анонимных читателей и отвечает 304 на актуальный ETag.
+    """
+    response = fetch(async_client, home_url)
+    assert response.status_code == HTTPStatus.OK
+    assert 'Sample News 0' in response.content.decode()
+    with django_assert_num_queries(0):
+        cached = fetch(async_client, home_url)
+    assert cached.content == response.content
+    response = fetch(
+        async_client, home_url, **{'If-None-Match': response['ETag']}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_async_detail_page(
+        asgi_profile,
+        async_reader_client,
+        single_comment,
+        news_detail_url_with_comment
+):
+    """
+    Проверяет, что асинхронная страница новости показывает
+    комментарии и форму и поддерживает условные запросы.
+    """
+    response = fetch(async_reader_client, news_detail_url_with_comment)
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['comments']) == [single_comment]
+    assert 'form' in response.context
+    assert response.has_header('Last-Modified')
+    response = fetch(
+        async_reader_client,
+        news_detail_url_with_comment,
+        **{'If-None-Match': response['ETag']},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_async_detail_accepts_comments(
+        asgi_profile,
+        async_reader_client,
+        single_news_item,
+        comment_data,
+        single_news_detail_url
+):
+    """Проверяет, что отправка комментария в ASGI-профиле работает."""
+    # AsyncClient в Django 3.2 не дочитывает multipart-тело.
+    response = fetch(
+        async_reader_client,
+        single_news_detail_url,
+        urlencode(comment_data),
+        content_type='application/x-www-form-urlencoded',
+        method='post',
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.get().status == Comment.Status.PENDING
+
+
+@pytest.mark.django_db
+def test_async_missing_news(asgi_profile, async_client):
+    """Проверяет, что несуществующая новость даёт 404."""
+    response = fetch(async_client, '/news/0/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_async_requests_share_threads(
+        asgi_profile,
+        async_reader_client,
+        single_comment,
+        news_detail_url_with_comment
+):
+    """
+    Проверяет, что сотня одновременных запросов не заводит
+    по потоку на запрос.
+    """
+    threads_before = threading.active_count()
+
+    async def crowd():
+        return await asyncio.gather(*(
+            async_reader_client.get(news_detail_url_with_comment)
+            for _ in range(100)
+        ))
+
+    responses = async_to_sync(crowd)()
+    assert {response.status_code for response in responses} == {
+        HTTPStatus.OK
+    }
+    assert threading.active_count() <= threads_before + 2
+
+
+def test_replica_middleware_runs_in_event_loop():
+    """
+    Проверяет, что middleware реплик в ASGI-профиле асинхронный
+    и Django не уводит ради него каждый запрос в поток.
+    """
+    async def get_response(request):
+        return HttpResponse()
+
+    middleware = ReplicaMiddleware(get_response)
+    assert asyncio.iscoroutinefunction(middleware)
+    assert asyncio.iscoroutinefunction(middleware.process_view)
+    sync_middleware = ReplicaMiddleware(lambda request: HttpResponse())
+    assert not asyncio.iscoroutinefunction(sync_middleware)
+    assert not asyncio.iscoroutinefunction(sync_middleware.process_view)
+
+
+@pytest.mark.django_db(
+    transaction=True, databases=('default', settings.REPLICA_DATABASE)
+)
+def test_async_pages_read_from_replica(
+        asgi_profile,
+        replica,
+        async_client,
+        async_reader_client,
+        single_comment,
+        home_url,
+        news_detail_url_with_comment
+):
+    """
+    Проверяет, что асинхронная страница новости читается с реплики,
+    а анонимная лента, кэшируемая под версией данных, — с основной.
+    """
+    replica()
+    Comment.objects.filter(pk=single_comment.pk).update(text='Свежий текст')
+    news = single_comment.news
+    news.title = 'Свежий заголовок'
+    news.save()
+    response = fetch(async_reader_client, news_detail_url_with_comment)
+    assert 'Свежий текст' not in response.content.decode()
+    response = fetch(async_reader_client, home_url)
+    assert 'Свежий заголовок' not in response.content.decode()
+    assert not response.has_header('ETag')
+    response = fetch(async_client, home_url)
+    assert 'Свежий заголовок' in response.content.decode()
+    replica()
+    response = fetch(async_reader_client, news_detail_url_with_comment)
+    assert 'Свежий текст' in response.content.decode()
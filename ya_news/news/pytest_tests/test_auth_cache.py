@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+STOCK_SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+STOCK_AUTH_MIDDLEWARE = (
+    'django.contrib.auth.middleware.AuthenticationMiddleware'
+)
+CACHED_AUTH_MIDDLEWARE = 'yanews.auth.CachedAuthenticationMiddleware'
+# Загрузка пользователя и сессии, а не JOIN с авторами комментариев.
+AUTH_LOOKUPS = ('FROM "auth_user" WHERE', 'FROM "django_session" WHERE')
+
+
+def logged_in_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def page_queries(client, url):
+    """Запросы к базе повторного открытия страницы."""
+    client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    return [query['sql'] for query in queries.captured_queries]
+
+
+def auth_queries(queries):
+    return [
+        sql for sql in queries
+        if any(lookup in sql for lookup in AUTH_LOOKUPS)
+    ]
+
+
+@pytest.mark.django_db
+def test_cached_session_and_user_save_queries(
+        settings,
+        regular_user,
+        single_news_item,
+        single_news_detail_url
+):
+    """
+    Проверяет, что повторная страница авторизованного читателя
+    не читает ни сессию, ни пользователя: на два запроса меньше,
+    чем с сессиями в базе и стандартным AuthenticationMiddleware.
+    """
+    url = single_news_detail_url
+    cached = page_queries(logged_in_client(regular_user), url)
+    assert auth_queries(cached) == []
+
+    settings.SESSION_ENGINE = STOCK_SESSION_ENGINE
+    settings.MIDDLEWARE = [
+        STOCK_AUTH_MIDDLEWARE if name == CACHED_AUTH_MIDDLEWARE else name
+        for name in settings.MIDDLEWARE
+    ]
+    stock = page_queries(logged_in_client(regular_user), url)
+    assert len(auth_queries(stock)) == 2
+    assert len(stock) - len(cached) == 2
+
+
+@pytest.mark.django_db
+def test_logout_drops_cached_user(regular_user, home_url):
+    """
+    Проверяет, что выход сбрасывает кэш пользователя: другая
+    сессия того же пользователя снова загружает его из базы.
+    """
+    first = logged_in_client(regular_user)
+    second = logged_in_client(regular_user)
+    assert auth_queries(page_queries(second, home_url)) == []
+    first.get(reverse('users:logout'))
+    with CaptureQueriesContext(connection) as queries:
+        response = second.get(home_url)
+    assert response.context['user'] == regular_user
+    assert len(auth_queries(
+        query['sql'] for query in queries.captured_queries
+    )) == 1
+
+
+@pytest.mark.django_db
+# Устаревшая сессия сверх обычного удаляется из базы.
+@pytest.mark.view_budget({'news:home': {'queries': 4}})
+def test_password_change_ends_other_sessions(regular_user, home_url):
+    """
+    Проверяет, что после смены пароля другая сессия не остаётся
+    авторизованной из-за кэша пользователя.
+    """
+    client = logged_in_client(regular_user)
+    assert client.get(home_url).context['user'].is_authenticated
+    regular_user.set_password('new-password')
+    regular_user.save()
+    assert not client.get(home_url).context['user'].is_authenticated
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections
+from django.test.client import Client
+
+from news.models import Comment, News
+
+WRITERS = 8
+COMMENTS_PER_WRITER = 5
+
+
+@pytest.mark.django_db
+def test_connection_pragmas():
+    """Проверяет, что соединение получает настройки для нагрузки."""
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        assert cursor.fetchone()[0] == 'wal'
+        cursor.execute('PRAGMA synchronous')
+        # 1 — NORMAL.
+        assert cursor.fetchone()[0] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_comment_writers(
+        settings,
+        django_user_model,
+        single_news_item,
+        single_news_detail_url,
+        comment_data
+):
+    """
+    Проверяет, что параллельные авторы комментариев не получают
+    «database is locked» и ни одна запись не теряется.
+    """
+    settings.RATE_LIMITS = {}
+    users = [
+        django_user_model.objects.create(username=f'writer_{number}')
+        for number in range(WRITERS)
+    ]
+
+    def write(user):
+        client = Client()
+        client.force_login(user)
+        try:
+            return [
+                client.post(single_news_detail_url, comment_data).status_code
+                for _ in range(COMMENTS_PER_WRITER)
+            ]
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(WRITERS) as pool:
+        statuses = [
+            status for result in pool.map(write, users) for status in result
+        ]
+    assert statuses == [HTTPStatus.FOUND] * WRITERS * COMMENTS_PER_WRITER
+    assert Comment.objects.filter(
+        news=single_news_item
+    ).count() == WRITERS * COMMENTS_PER_WRITER
+    assert News.objects.get().comment_count == 0
@@ -1,7 +1,19 @@
+import json
+from http import HTTPStatus
+
 import pytest
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
+from news.api import ApiListView, ApiView
+from news.cache import home_page_key
 from news.forms import CommentForm
+from news.models import Comment, News
+from news.pagination import KeysetPaginator
+from yanews.budget import BudgetExceeded, view_budget
 
 
 @pytest.mark.django_db
@@ -17,7 +29,7 @@ def test_news_count_on_home_page(
     response = reader_logged_in_client.get(home_url)
     assert 'news_list' in response.context
     obj_list = response.context['news_list']
-    assert obj_list.count() <= settings.NEWS_COUNT_ON_HOME_PAGE
+    assert len(obj_list) <= settings.NEWS_COUNT_ON_HOME_PAGE
 
 
 @pytest.mark.django_db
@@ -33,6 +45,282 @@ def test_news_order_on_home_page(client, multiple_news_items, home_url):
     assert dates == sorted(dates, reverse=True)
 
 
+@pytest.mark.django_db
+def test_home_page_archive_cursor(client, multiple_news_items, home_url):
+    """
+    Проверяет, что архив новостей листается по курсору
+    без пропусков и повторов даже при одинаковых датах.
+    """
+    response = client.get(home_url)
+    first_page = list(response.context['news_list'])
+    cursor = response.context['next_cursor']
+    assert cursor
+
+    response = client.get(home_url, {'cursor': cursor})
+    second_page = list(response.context['news_list'])
+    assert response.context['next_cursor'] is None
+    ids = [news.pk for news in first_page + second_page]
+    assert len(set(ids)) == settings.NEWS_COUNT_ON_HOME_PAGE + 5
+
+
+@pytest.mark.django_db
+def test_keyset_page_is_one_query(
+        multiple_news_items,
+        django_assert_num_queries
+):
+    """
+    Проверяет, что страница и признак следующей страницы выбираются
+    одним запросом, и в том числе когда страница заполнена ровно.
+    """
+    paginator = KeysetPaginator(
+        News.objects.all(), keys=('-date', 'id'), per_page=5
+    )
+    cursor = None
+    pages = []
+    for _ in range(3):
+        with django_assert_num_queries(1):
+            page = paginator.page(cursor)
+        pages.append(len(page.object_list))
+        cursor = page.next_cursor
+    assert pages == [5, 5, 5]
+    assert cursor is None
+
+
+@pytest.mark.django_db
+def test_news_feed_streams_whole_archive(
+        client,
+        multiple_news_items,
+        news_feed_url
+):
+    """
+    Проверяет, что NDJSON-лента отдаёт все новости
+    от самой свежей к самой старой.
+    """
+    response = client.get(news_feed_url)
+    assert response.streaming
+    assert response['Content-Type'] == 'application/x-ndjson'
+    rows = [
+        json.loads(line)
+        for line in b''.join(response.streaming_content).splitlines()
+    ]
+    assert len(rows) == settings.NEWS_COUNT_ON_HOME_PAGE + 5
+    dates = [row['date'] for row in rows]
+    assert dates == sorted(dates, reverse=True)
+
+
+@pytest.mark.django_db
+def test_home_page_does_not_query_comments(
+        client,
+        multiple_comments,
+        single_news_item,
+        home_url
+):
+    """
+    Проверяет, что главная страница показывает счётчик комментариев,
+    не обращаясь к таблице комментариев.
+    """
+    single_news_item.recount_comments()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(home_url)
+    assert not any(
+        'news_comment' in query['sql'] for query in queries.captured_queries
+    )
+    assert (
+        f'Комментариев: {settings.NEWS_COUNT_ON_HOME_PAGE}'
+        in response.content.decode()
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('query', ({}, {'q': 'sample'}))
+def test_news_lists_do_not_load_text(
+        client,
+        single_news_item,
+        query,
+        home_url,
+        search_url
+):
+    """
+    Проверяет, что лента и поиск показывают анонс новости,
+    не читая из базы её полный текст.
+    """
+    single_news_item.text = 'Полный текст ' * 20
+    single_news_item.save()
+    url = search_url if query else home_url
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, query)
+    news_queries = [
+        captured['sql'] for captured in queries.captured_queries
+        if 'news_news' in captured['sql']
+    ]
+    assert news_queries
+    assert not any('text' in sql for sql in news_queries)
+    assert single_news_item.summary in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_view_stats_recorded(client, single_news_item, home_url, view_stats):
+    """
+    Проверяет, что для каждого запроса записываются имя URL,
+    число SQL-запросов и время рендеринга.
+    """
+    client.get(home_url)
+    [stats] = view_stats
+    assert stats.url_name == 'news:home'
+    assert stats.queries == 1
+    assert stats.render_time > 0
+    assert stats.total_time >= stats.render_time
+
+
+@pytest.mark.django_db
+def test_view_over_budget_fails(client, single_news_item, home_url):
+    """Проверяет, что превышение бюджета запросов роняет тест."""
+    with pytest.raises(BudgetExceeded, match='news:home: queries'):
+        with view_budget({'news:home': {'queries': 0}}):
+            client.get(home_url)
+
+
+@pytest.mark.django_db
+def test_home_page_served_from_cache(
+        client,
+        cache_backend,
+        multiple_news_items,
+        home_url,
+        view_stats
+):
+    """
+    Проверяет, что повторный анонимный запрос главной страницы
+    обслуживается из кэша без обращений к базе.
+    """
+    first = client.get(home_url)
+    second = client.get(home_url)
+    assert second.content == first.content
+    assert [stats.queries for stats in view_stats][-1] == 0
+
+
+@pytest.mark.django_db
+def test_home_page_cache_invalidated(
+        client,
+        cache_backend,
+        single_news_item,
+        news_author,
+        home_url
+):
+    """
+    Проверяет, что новая новость и новый комментарий
+    сразу сбрасывают закэшированную главную страницу.
+    """
+    client.get(home_url)
+    News.objects.create(title='Fresh News', text='Fresh text')
+    assert 'Fresh News' in client.get(home_url).content.decode()
+
+    News.change_comment_count(single_news_item.pk, 1)
+    Comment.objects.create(
+        news=single_news_item, author=news_author, text='Fresh comment'
+    )
+    assert 'Комментариев: 1' in client.get(home_url).content.decode()
+
+
+@pytest.mark.django_db
+def test_home_page_cached_before_commit_is_reset(
+        client,
+        single_news_item,
+        home_url,
+        django_capture_on_commit_callbacks
+):
+    """
+    Проверяет, что страница, собранная по старым данным до фиксации
+    изменения, не остаётся в кэше под новой версией.
+    """
+    with django_capture_on_commit_callbacks(execute=True):
+        News.objects.create(title='Fresh News', text='Fresh text')
+        # Читатель, который не видит незафиксированную запись.
+        client.get(home_url)
+        cache.set(
+            home_page_key(),
+            cache.get(home_page_key()).replace(b'Fresh News', b''),
+        )
+    assert 'Fresh News' in client.get(home_url).content.decode()
+
+
+@pytest.mark.django_db
+def test_news_detail_not_modified(
+        client,
+        single_comment,
+        news_author,
+        news_detail_url,
+        view_stats
+):
+    """
+    Проверяет, что повторный запрос страницы новости с актуальным ETag
+    получает 304 одним агрегатным запросом, а новый комментарий
+    делает копию читателя устаревшей.
+    """
+    response = client.get(news_detail_url)
+    etag = response['ETag']
+    assert response.has_header('Last-Modified')
+
+    response = client.get(news_detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert view_stats[-1].queries == 1
+
+    Comment.objects.create(
+        news=single_comment.news, author=news_author, text='New comment'
+    )
+    response = client.get(news_detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_home_page_not_modified(client, single_news_item, home_url):
+    """Проверяет, что главная с актуальным ETag отвечает 304."""
+    etag = client.get(home_url)['ETag']
+    response = client.get(home_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_first(client, search_url):
+    """
+    Проверяет, что поиск находит новости по началу слова
+    и ставит совпадения в заголовке выше совпадений в тексте.
+    """
+    in_text = News.objects.create(
+        title='Погода', text='Ожидаются дожди и грозы'
+    )
+    in_title = News.objects.create(
+        title='Грозы над городом', text='Синоптики предупреждают'
+    )
+    News.objects.create(title='Спорт', text='Футбол')
+    response = client.get(search_url, {'q': 'гроз'})
+    assert list(response.context['news_list']) == [in_title, in_text]
+
+
+@pytest.mark.django_db
+def test_search_index_follows_changes(client, single_news_item, search_url):
+    """
+    Проверяет, что индекс поиска обновляется при изменении
+    и удалении новости.
+    """
+    single_news_item.title = 'Обновлённый заголовок'
+    single_news_item.save()
+    response = client.get(search_url, {'q': 'обновлённый'})
+    assert list(response.context['news_list']) == [single_news_item]
+    assert not client.get(search_url, {'q': 'Title'}).context['news_list']
+
+    single_news_item.delete()
+    response = client.get(search_url, {'q': 'обновлённый'})
+    assert not response.context['news_list']
+
+
+@pytest.mark.django_db
+def test_search_ignores_query_syntax(client, single_news_item, search_url):
+    """Проверяет, что служебные символы FTS5 в запросе не ломают поиск."""
+    response = client.get(search_url, {'q': 'Sample" (news*'})
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['news_list']) == [single_news_item]
+
+
 @pytest.mark.django_db
 def test_comments_order_on_news_detail_page(
         client,
@@ -52,6 +340,40 @@ def test_comments_order_on_news_detail_page(
     assert created_times == sorted(created_times)
 
 
+@pytest.mark.django_db
+def test_comments_paginated_on_news_detail_page(
+        client,
+        paginated_comments,
+        news_detail_url,
+        news_comments_url
+):
+    """
+    Проверяет, что страница новости показывает только первую порцию
+    комментариев, а остальные отдаются фрагментом по курсору
+    без пропусков и повторов.
+    """
+    response = client.get(news_detail_url)
+    first_page = list(response.context['comments'])
+    assert len(first_page) == settings.COMMENTS_COUNT_ON_PAGE
+    cursor = response.context['next_cursor']
+    assert cursor
+
+    fragment = client.get(news_comments_url, {'cursor': cursor}).json()
+    assert fragment['next_cursor'] is None
+    for comment in first_page:
+        assert f'{comment.text}<' not in fragment['html']
+    total = settings.COMMENTS_COUNT_ON_PAGE + 5
+    for i in range(settings.COMMENTS_COUNT_ON_PAGE, total):
+        assert f'Paged comment {i}<' in fragment['html']
+
+
+@pytest.mark.django_db
+def test_invalid_comments_cursor(client, single_news_item, news_comments_url):
+    """Проверяет, что на испорченный курсор возвращается 404."""
+    response = client.get(news_comments_url, {'cursor': 'not-a-cursor'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
 @pytest.mark.django_db
 def test_comment_form_for_anonymous_user(
         client,
@@ -80,3 +402,115 @@ def test_comment_form_for_reader(
     assert 'form' in response.context
     form_obj = response.context['form']
     assert isinstance(form_obj, CommentForm)
+
+
+@pytest.mark.django_db
+def test_api_news_list_paginated(
+        client,
+        settings,
+        multiple_news_items,
+        api_news_url
+):
+    """
+    Проверяет, что лента в API отдаёт поля по умолчанию
+    и листается курсором до конца без повторов.
+    """
+    settings.API_PAGE_SIZE = 4
+    data = client.get(api_news_url).json()
+    assert len(data['results']) == settings.API_PAGE_SIZE
+    assert set(data['results'][0]) == {'id', 'title', 'date', 'comment_count'}
+    ids = [row['id'] for row in data['results']]
+    while data['next_cursor']:
+        data = client.get(
+            api_news_url, {'cursor': data['next_cursor']}
+        ).json()
+        ids += [row['id'] for row in data['results']]
+    assert ids == list(
+        News.objects.order_by('-date', 'id').values_list('id', flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_api_sparse_fields(client, single_news_item, api_news_detail_url):
+    """
+    Проверяет, что `?fields=` сужает и ответ, и SELECT,
+    а неизвестное поле отклоняется с кодом 400.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(api_news_detail_url, {'fields': 'title,id'})
+    assert response.json() == {
+        'title': single_news_item.title, 'id': single_news_item.pk
+    }
+    assert '"text"' not in queries.captured_queries[-1]['sql']
+    response = client.get(api_news_detail_url, {'fields': 'title,secret'})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'secret' in response.json()['errors'][0]
+
+
+@pytest.mark.django_db
+def test_api_comments_only_approved(
+        client,
+        single_comment,
+        news_author,
+        api_comments_url
+):
+    """
+    Проверяет, что API отдаёт только одобренные комментарии
+    с именем автора, а несуществующая новость даёт JSON 404.
+    """
+    Comment.objects.create(
+        news=single_comment.news,
+        author=news_author,
+        text='Pending comment',
+        status=Comment.Status.PENDING,
+    )
+    data = client.get(api_comments_url, {'fields': 'author,text'}).json()
+    assert data == {
+        'results': [
+            {'author': news_author.username, 'text': single_comment.text}
+        ],
+        'next_cursor': None,
+    }
+    response = client.get(
+        reverse('news:api-comments', args=[single_comment.news_id + 1])
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json()['errors']
+
+
+@pytest.mark.django_db
+def test_api_not_modified(
+        client,
+        single_news_item,
+        api_news_url,
+        django_assert_num_queries
+):
+    """
+    Проверяет, что ответ API с актуальным ETag получает 304
+    без запросов к базе, а изменение новостей его обновляет.
+    """
+    response = client.get(api_news_url)
+    assert 'public' in response['Cache-Control']
+    etag = response['ETag']
+    with django_assert_num_queries(0):
+        response = client.get(api_news_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    News.objects.create(title='Fresh News', text='Fresh text')
+    response = client.get(api_news_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_api_views_require_data_source():
+    """
+    Проверяет, что ресурс API без `get_data()` или список
+    без `get_queryset()` не создаётся, а не падает на запросе.
+    """
+    class NoData(ApiView):
+        pass
+
+    class NoQueryset(ApiListView):
+        pass
+
+    for view_class in (NoData, NoQueryset):
+        with pytest.raises(TypeError):
+            view_class()
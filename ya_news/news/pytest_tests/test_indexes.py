@@ -0,0 +1,79 @@
+import pytest
+from django.db import connection
+
+from news.queue import pending_comments
+
+
+class QueryRecorder:
+    """Запоминает SQL и параметры запросов к заданной таблице."""
+
+    def __init__(self, table):
+        self.table = table
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if f'FROM "{self.table}"' in sql and sql.startswith('SELECT'):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def query_plans(client, url, table, data=None):
+    """Возвращает планы SQLite для запросов представления к таблице."""
+    recorder = QueryRecorder(table)
+    with connection.execute_wrapper(recorder):
+        client.get(url, data)
+    assert recorder.queries
+    plans = []
+    with connection.cursor() as cursor:
+        for sql, params in recorder.queries:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plans.append(' | '.join(row[-1] for row in cursor.fetchall()))
+    return plans
+
+
+@pytest.mark.django_db
+def test_home_page_uses_date_index(
+        reader_logged_in_client,
+        multiple_news_items,
+        home_url
+):
+    """
+    Проверяет, что главная страница и её следующие страницы
+    читают новости по индексу `(date DESC, id)` без сортировки.
+    """
+    client = reader_logged_in_client
+    plans = query_plans(client, home_url, 'news_news')
+    cursor = client.get(home_url).context['next_cursor']
+    plans += query_plans(client, home_url, 'news_news', {'cursor': cursor})
+    for plan in plans:
+        assert 'news_date_id_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+    assert plans[-1].startswith('SEARCH news_news')
+
+
+@pytest.mark.django_db
+def test_detail_page_uses_comment_index(
+        client,
+        paginated_comments,
+        news_detail_url
+):
+    """
+    Проверяет, что одобренные комментарии новости выбираются поиском
+    по индексу `(news_id, status, created)` без сортировки.
+    """
+    plans = query_plans(client, news_detail_url, 'news_comment')
+    for plan in plans:
+        assert plan.startswith('SEARCH news_comment')
+        assert 'comment_news_status_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+
+
+@pytest.mark.django_db
+def test_moderation_queue_uses_partial_index():
+    """Проверяет, что очередь модерации читается по частичному индексу."""
+    sql, params = pending_comments()[:100].query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = ' | '.join(row[-1] for row in cursor.fetchall())
+    assert 'comment_pending_idx' in plan
+    assert 'TEMP B-TREE' not in plan
@@ -1,10 +1,20 @@
 from http import HTTPStatus
+from io import StringIO
+from unittest import mock
 
 import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.views.generic.detail import SingleObjectMixin
+from pytest_lazyfixture import lazy_fixture
 from pytest_django.asserts import assertFormError
 
-from news.models import Comment
-from news.forms import BAD_WORDS, WARNING
+from news.cache import get_version as get_feed_version
+from news.models import BannedWord, Comment, News
+from news.forms import BAD_WORDS, WARNING, CommentForm
+from news.moderation import AhoCorasick, Match, get_matcher, get_version
+from news.queue import process_batch
+from yanews.ratelimit import get_counters, hit
 
 
 @pytest.mark.django_db
@@ -32,14 +42,80 @@ def test_reader_can_submit_comment(
 ):
     """
     Проверяет, что авторизованный пользователь
-    может отправить комментарий к новости.
+    может отправить комментарий к новости, а комментарий в очереди
+    модерации не сбрасывает кэш ленты.
     """
+    version = get_feed_version()
     response = reader_logged_in_client.post(
         single_news_detail_url,
         comment_data
     )
     assert Comment.objects.count() == 1
     assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.get().status == Comment.Status.PENDING
+    single_news_item.refresh_from_db()
+    assert single_news_item.comment_count == 0
+    assert get_feed_version() == version
+
+
+@pytest.mark.django_db
+def test_moderation_worker_approves_comments(
+        reader_logged_in_client,
+        single_news_item,
+        comment_data,
+        single_news_detail_url
+):
+    """
+    Проверяет, что обработчик очереди одобряет комментарий,
+    учитывает его в счётчике и показывает на странице новости.
+    """
+    reader_logged_in_client.post(single_news_detail_url, comment_data)
+    response = reader_logged_in_client.get(single_news_detail_url)
+    assert not response.context['comments']
+    call_command('moderate_comments', once=True)
+    assert Comment.objects.get().status == Comment.Status.APPROVED
+    single_news_item.refresh_from_db()
+    assert single_news_item.comment_count == 1
+    response = reader_logged_in_client.get(single_news_detail_url)
+    assert [comment.text for comment in response.context['comments']] == [
+        comment_data['text']
+    ]
+
+
+@pytest.mark.django_db
+def test_moderation_worker_rejects_spam(single_comment, news_author):
+    """
+    Проверяет, что обработчик отклоняет ссылочный спам, повторы
+    и слова, попавшие в словарь после отправки комментария.
+    """
+    pending = [
+        Comment.objects.create(
+            news=single_comment.news,
+            author=news_author,
+            text=text,
+            status=Comment.Status.PENDING,
+        )
+        for text in (
+            'http://a.example http://b.example www.c.example',
+            single_comment.text,
+            'Новое ругательство',
+            'Обычный комментарий',
+        )
+    ]
+    BannedWord.objects.create(word='ругательство')
+    assert process_batch(batch_size=2) == (0, 2)
+    assert process_batch() == (1, 1)
+    assert process_batch() == (0, 0)
+    assert [
+        Comment.objects.get(pk=comment.pk).status for comment in pending
+    ] == [
+        Comment.Status.REJECTED,
+        Comment.Status.REJECTED,
+        Comment.Status.REJECTED,
+        Comment.Status.APPROVED,
+    ]
+    single_comment.news.refresh_from_db()
+    assert single_comment.news.comment_count == 1
 
 
 @pytest.mark.django_db
@@ -62,6 +138,210 @@ def test_comment_with_bad_words(
     assertFormError(response, 'form', 'text', WARNING)
 
 
+@pytest.mark.django_db
+def test_bad_word_positions_reported():
+    """
+    Проверяет, что форма сообщает все найденные запрещённые слова
+    с их позициями в тексте, без учёта регистра.
+    """
+    text = f'Ты {BAD_WORDS[0].upper()} и {BAD_WORDS[1]}'
+    form = CommentForm({'text': text})
+    assert not form.is_valid()
+    assert [
+        text[match.start:match.end].lower() for match in form.bad_word_matches
+    ] == [BAD_WORDS[0], BAD_WORDS[1]]
+
+
+@pytest.mark.django_db
+def test_banned_words_from_database(
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks
+):
+    """
+    Проверяет, что слово из словаря модераторов сразу после фиксации
+    начинает отклонять комментарии, а при неизменном словаре проверка
+    не обращается к базе.
+    """
+    assert CommentForm({'text': 'Просто бяка'}).is_valid()
+    with django_capture_on_commit_callbacks(execute=True):
+        word = BannedWord.objects.create(word='Бяка')
+    assert not CommentForm({'text': 'Просто бяка'}).is_valid()
+    with django_assert_num_queries(0):
+        assert not CommentForm({'text': 'Снова БЯКА'}).is_valid()
+    with django_capture_on_commit_callbacks(execute=True):
+        word.delete()
+    assert CommentForm({'text': 'Просто бяка'}).is_valid()
+
+
+@pytest.mark.django_db
+def test_banned_words_version_changes_on_commit(
+        django_capture_on_commit_callbacks
+):
+    """
+    Проверяет, что версия словаря меняется только после фиксации:
+    до неё другие процессы читают из базы ещё старый словарь.
+    """
+    version = get_version()
+    with django_capture_on_commit_callbacks(execute=True):
+        BannedWord.objects.create(word='Бяка')
+        assert get_version() == version
+    assert get_version() != version
+
+
+def test_automaton_finds_overlapping_words():
+    """Проверяет, что автомат находит пересекающиеся и вложенные слова."""
+    matcher = AhoCorasick(('he', 'she', 'his', 'hers'))
+    assert list(matcher.finditer('ushers')) == [
+        Match(1, 4, 'she'), Match(2, 4, 'he'), Match(2, 6, 'hers'),
+    ]
+    assert matcher.search('nothing here') == Match(8, 10, 'he')
+    assert matcher.search('clean') is None
+
+
+@pytest.fixture
+def warm_matcher():
+    """Собирает автомат заранее, чтобы проверка слов не читала базу."""
+    get_matcher(defaults=BAD_WORDS)
+
+
+# Счётчики включают пару SAVEPOINT / RELEASE SAVEPOINT, которую
+# transaction.atomic выполняет внутри тестовой транзакции.
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'client_fixture, url, data, expected_queries',
+    (
+        # Пользователь, новость, INSERT комментария. Сессия — из кэша.
+        (
+            lazy_fixture('reader_logged_in_client'),
+            lazy_fixture('single_news_detail_url'),
+            {'text': 'New comment'},
+            3,
+        ),
+        # Пользователь, комментарий, возврат в очередь, счётчик, UPDATE.
+        (
+            lazy_fixture('author_logged_in_client'),
+            lazy_fixture('edit_comment_url'),
+            {'text': 'Edited comment'},
+            5 + 2,
+        ),
+        # Пользователь, комментарий, возврат в очередь, DELETE, счётчик.
+        (
+            lazy_fixture('author_logged_in_client'),
+            lazy_fixture('delete_comment_url'),
+            {},
+            5 + 2,
+        ),
+    ),
+    ids=('comment', 'edit', 'delete'),
+)
+def test_comment_writes_query_count(
+        client_fixture,
+        url,
+        data,
+        expected_queries,
+        single_comment,
+        warm_matcher,
+        django_assert_num_queries
+):
+    """
+    Проверяет, что запись комментария не перечитывает ни новость,
+    ни комментарий после сохранения.
+    """
+    News.change_comment_count(single_comment.news_id, 1)
+    with django_assert_num_queries(expected_queries):
+        response = client_fixture.post(url, data)
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == reverse(
+        'news:detail', args=[single_comment.news_id]
+    ) + '#comments'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'url, data',
+    (
+        (lazy_fixture('edit_comment_url'), {'text': 'Edited comment'}),
+        (lazy_fixture('delete_comment_url'), {}),
+    ),
+    ids=('edit', 'delete'),
+)
+# Запросы модерации, выполненной посреди запроса, не в счёт бюджета.
+@pytest.mark.view_budget({
+    'news:edit': {'queries': 20}, 'news:delete': {'queries': 20}
+})
+def test_comment_approved_while_edited(
+        author_logged_in_client,
+        url,
+        data,
+        single_comment
+):
+    """
+    Проверяет, что комментарий, одобренный модерацией после его
+    загрузки в форму правки или удаления, не оставляет лишнего
+    в счётчике комментариев новости.
+    """
+    Comment.objects.filter(pk=single_comment.pk).update(
+        status=Comment.Status.PENDING
+    )
+    get_object = SingleObjectMixin.get_object
+
+    def approve_after_load(view, *args, **kwargs):
+        comment = get_object(view, *args, **kwargs)
+        process_batch()
+        return comment
+
+    with mock.patch.object(
+        SingleObjectMixin, 'get_object', approve_after_load
+    ):
+        author_logged_in_client.post(url, data)
+    single_comment.news.refresh_from_db()
+    assert single_comment.news.comment_count == 0
+    assert not Comment.objects.filter(status=Comment.Status.APPROVED)
+
+
+@pytest.mark.django_db
+def test_comment_rate_limit(
+        settings,
+        reader_logged_in_client,
+        regular_user,
+        single_news_item,
+        single_news_detail_url
+):
+    """
+    Проверяет, что сверх лимита запись отклоняется с кодом 429
+    и заголовком Retry-After, а отказы видны в счётчиках.
+    """
+    settings.RATE_LIMITS = {'comments': {'requests': 2, 'period': 60}}
+    statuses = [
+        reader_logged_in_client.post(
+            single_news_detail_url, {'text': f'Comment {i}'}
+        )
+        for i in range(3)
+    ]
+    assert [response.status_code for response in statuses] == [
+        HTTPStatus.FOUND, HTTPStatus.FOUND, HTTPStatus.TOO_MANY_REQUESTS
+    ]
+    assert statuses[-1]['Retry-After'] == '30'
+    assert Comment.objects.count() == 2
+    assert get_counters('comments', regular_user.pk) == {
+        'allowed': 2, 'limited': 1
+    }
+
+
+def test_token_bucket_refills():
+    """Проверяет, что токены восстанавливаются со временем."""
+    with mock.patch('yanews.ratelimit.time.time', return_value=1000.0):
+        assert hit('test', 1, requests=2, period=10).allowed
+        assert hit('test', 1, requests=2, period=10).allowed
+        assert hit('test', 1, requests=2, period=10) == (False, 5)
+    with mock.patch('yanews.ratelimit.time.time', return_value=1005.0):
+        assert hit('test', 1, requests=2, period=10).allowed
+        assert not hit('test', 1, requests=2, period=10).allowed
+    with mock.patch('yanews.ratelimit.time.time', return_value=1100.0):
+        assert hit('test', 1, requests=2, period=10).allowed
+        assert hit('test', 1, requests=2, period=10).allowed
+
+
 @pytest.mark.django_db
 def test_author_delete_comment(
         author_logged_in_client,
@@ -72,9 +352,68 @@ def test_author_delete_comment(
     Проверяет, что автор комментария
     может успешно удалить свой комментарий.
     """
+    news = single_comment.news
+    News.change_comment_count(news.pk, 1)
     delete = author_logged_in_client.post(delete_comment_url)
     assert delete.status_code == HTTPStatus.FOUND
     assert Comment.objects.count() == 0
+    news.refresh_from_db()
+    assert news.comment_count == 0
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(multiple_comments, single_news_item):
+    """
+    Проверяет, что команда recount_comments восстанавливает
+    счётчики комментариев по фактическим данным.
+    """
+    call_command('recount_comments', batch_size=1)
+    single_news_item.refresh_from_db()
+    assert (
+        single_news_item.comment_count == Comment.objects.filter(
+            news=single_news_item
+        ).count()
+    )
+
+
+@pytest.mark.django_db
+def test_generate_news_command(news_author, django_user_model):
+    """
+    Проверяет, что команда generate_news создаёт данные
+    с согласованными счётчиками комментариев, а нумерация
+    пользователей `load_N` не зависит от прочих пользователей.
+    """
+    stdout = StringIO()
+    call_command(
+        'generate_news', users=3, news=10, comments=50, batch_size=7,
+        stdout=stdout
+    )
+    assert set(django_user_model.objects.filter(
+        username__startswith='load_'
+    ).values_list('username', flat=True)) == {'load_0', 'load_1', 'load_2'}
+    assert '--first-user 0 --users 3' in stdout.getvalue()
+    assert News.objects.count() == 10
+    assert 0 < Comment.objects.count() <= 50
+    approved = Comment.objects.filter(status=Comment.Status.APPROVED)
+    assert sum(
+        News.objects.values_list('comment_count', flat=True)
+    ) == approved.count()
+    assert not News.objects.filter(summary='').exists()
+
+
+@pytest.mark.django_db
+def test_news_summary_follows_text(single_news_item):
+    """
+    Проверяет, что анонс новости заполняется при сохранении,
+    в том числе при сохранении только текста.
+    """
+    assert single_news_item.summary == 'Sample news content'
+    single_news_item.text = ' '.join(f'слово{index}' for index in range(20))
+    single_news_item.save(update_fields=['text'])
+    single_news_item.refresh_from_db()
+    assert single_news_item.summary == (
+        ' '.join(f'слово{index}' for index in range(15)) + ' …'
+    )
 
 
 @pytest.mark.django_db
@@ -86,15 +425,23 @@ def test_author_edit_comment(
 ):
     """
     Проверяет, что автор комментария
-    может редактировать текст своего комментария.
+    может редактировать текст своего комментария,
+    а исправленный комментарий заново уходит на модерацию
+    и пропадает из кэшированных страниц.
     """
     original_author = single_comment.author
     original_news = single_comment.news
+    News.change_comment_count(original_news.pk, 1)
+    version = get_feed_version()
 
     response = author_logged_in_client.post(edit_comment_url, comment_data)
     assert response.status_code == HTTPStatus.FOUND
     single_comment.refresh_from_db()
     assert single_comment.text == comment_data['text']
+    assert single_comment.status == Comment.Status.PENDING
+    original_news.refresh_from_db()
+    assert original_news.comment_count == 0
+    assert get_feed_version() != version
 
     assert single_comment.author == original_author
     assert single_comment.news == original_news
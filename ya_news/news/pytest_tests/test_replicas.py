@@ -0,0 +1,105 @@
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+
+from news.models import Comment
+
+BOTH_DATABASES = pytest.mark.django_db(
+    transaction=True, databases=('default', settings.REPLICA_DATABASE)
+)
+
+
+@BOTH_DATABASES
+def test_reads_go_to_replica(
+        replica,
+        client,
+        single_comment,
+        news_detail_url_with_comment
+):
+    """
+    Проверяет, что страница новости читается с реплики:
+    изменение, которое до неё не дошло, не видно.
+    """
+    replica()
+    Comment.objects.filter(pk=single_comment.pk).update(text='Свежий текст')
+    response = client.get(news_detail_url_with_comment)
+    assert list(response.context['comments']) == [single_comment]
+    assert response.context['comments'][0].text == single_comment.text
+    assert 'Свежий текст' not in response.content.decode()
+    replica()
+    response = client.get(news_detail_url_with_comment)
+    assert 'Свежий текст' in response.content.decode()
+
+
+@BOTH_DATABASES
+def test_writer_reads_from_primary(
+        replica,
+        reader_logged_in_client,
+        client,
+        single_comment,
+        comment_data,
+        news_detail_url_with_comment
+):
+    """
+    Проверяет, что после записи пользователь читает с основной базы
+    и видит свежие данные, а остальные читают с реплики.
+    """
+    replica()
+    Comment.objects.filter(pk=single_comment.pk).update(text='Свежий текст')
+    reader_logged_in_client.post(news_detail_url_with_comment, comment_data)
+    response = reader_logged_in_client.get(news_detail_url_with_comment)
+    assert 'Свежий текст' in response.content.decode()
+    response = client.get(news_detail_url_with_comment)
+    assert 'Свежий текст' not in response.content.decode()
+
+
+@BOTH_DATABASES
+def test_writer_pin_expires(
+        replica,
+        reader_logged_in_client,
+        single_comment,
+        comment_data,
+        news_detail_url_with_comment
+):
+    """Проверяет, что закрепление за основной базой временное."""
+    replica()
+    Comment.objects.filter(pk=single_comment.pk).update(text='Свежий текст')
+    reader_logged_in_client.post(news_detail_url_with_comment, comment_data)
+    cache.clear()
+    response = reader_logged_in_client.get(news_detail_url_with_comment)
+    assert 'Свежий текст' not in response.content.decode()
+
+
+@BOTH_DATABASES
+def test_cached_home_page_not_stale(
+        replica,
+        client,
+        reader_logged_in_client,
+        single_news_item,
+        home_url
+):
+    """
+    Проверяет, что после записи, которая ещё не дошла до реплики,
+    анонимная страница ленты, кэшируемая под новой версией данных,
+    читается с основной базы, а страница читателя с реплики
+    не получает ETag этой версии.
+    """
+    replica()
+    single_news_item.title = 'Свежий заголовок'
+    single_news_item.save()
+    for _ in range(2):
+        response = client.get(home_url)
+        assert 'Свежий заголовок' in response.content.decode()
+    assert response.has_header('ETag')
+    response = reader_logged_in_client.get(home_url)
+    assert 'Свежий заголовок' not in response.content.decode()
+    assert not response.has_header('ETag')
+
+
+@pytest.mark.django_db
+def test_mirror_replica_is_not_used(client, home_url):
+    """
+    Проверяет, что реплика-зеркало той же базы не используется:
+    тесту без доступа к ней страницы всё равно доступны.
+    """
+    assert client.get(home_url).status_code == 200
@@ -0,0 +1,103 @@
+"""
+Очередь модерации комментариев.
+
+Комментарий с сайта сохраняется со статусом `pending` и сразу
+возвращает ответ читателю. Очередью служит сама таблица комментариев:
+команда `moderate_comments` порциями выбирает ожидающие записи по
+частичному индексу, прогоняет их через проверки `CHECKS` и переводит
+в `approved` или `rejected`. Внешний брокер не нужен.
+
+Статус меняется условным UPDATE (`WHERE status = 'pending'`), поэтому
+несколько одновременно запущенных обработчиков не одобрят один
+комментарий дважды и не сдвинут счётчик лишний раз.
+"""
+import logging
+import re
+from collections import Counter
+
+from django.db import transaction
+
+from .cache import bump_version
+from .forms import BAD_WORDS
+from .models import Comment, News
+from .moderation import get_matcher
+
+logger = logging.getLogger(__name__)
+
+MAX_LINKS = 2
+LINK_RE = re.compile(r'https?://|www\.', re.IGNORECASE)
+
+
+def check_bad_words(comment):
+    """Словарь мог пополниться после отправки комментария."""
+    match = get_matcher(defaults=BAD_WORDS).search(comment.text.lower())
+    if match:
+        return f'запрещённое слово «{match.word}»'
+
+
+def check_links(comment):
+    """Комментарий из одних ссылок почти наверняка спам."""
+    if len(LINK_RE.findall(comment.text)) > MAX_LINKS:
+        return 'слишком много ссылок'
+
+
+def check_duplicate(comment):
+    """Тот же автор уже оставил такой же комментарий к новости."""
+    duplicate = Comment.objects.filter(
+        news_id=comment.news_id,
+        author_id=comment.author_id,
+        status=Comment.Status.APPROVED,
+        text=comment.text,
+    ).exclude(pk=comment.pk)
+    if duplicate.exists():
+        return 'повтор комментария'
+
+
+CHECKS = (check_bad_words, check_links, check_duplicate)
+
+
+def review(comment):
+    """Причина отклонения комментария или `None`, если он прошёл."""
+    for check in CHECKS:
+        reason = check(comment)
+        if reason:
+            return reason
+    return None
+
+
+def pending_comments():
+    return Comment.objects.filter(status=Comment.Status.PENDING).order_by('id')
+
+
+def process_batch(batch_size=100):
+    """
+    Проверяет очередную порцию очереди.
+
+    Возвращает пару (одобрено, отклонено). Счётчики комментариев
+    новостей меняются в той же транзакции, что и статусы.
+    """
+    comments = list(pending_comments()[:batch_size])
+    approved = Counter()
+    rejected = 0
+    with transaction.atomic():
+        for comment in comments:
+            reason = review(comment)
+            status = (
+                Comment.Status.REJECTED if reason else Comment.Status.APPROVED
+            )
+            claimed = Comment.objects.filter(
+                pk=comment.pk, status=Comment.Status.PENDING
+            ).update(status=status)
+            if not claimed:
+                # Комментарий уже обработал другой процесс или его удалили.
+                continue
+            if reason:
+                logger.info('Comment %s rejected: %s', comment.pk, reason)
+                rejected += 1
+            else:
+                approved[comment.news_id] += 1
+        for news_id, count in approved.items():
+            News.change_comment_count(news_id, count)
+    if approved:
+        bump_version()
+    return sum(approved.values()), rejected
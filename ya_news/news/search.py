@@ -0,0 +1,51 @@
+"""
+Полнотекстовый поиск по новостям на SQLite FTS5.
+
+Индекс `news_news_fts` хранит только токены заголовка и текста и
+ссылается на `news_news` как на внешнее содержимое. Синхронизацию
+ведут триггеры базы, поэтому индекс видит и `bulk_create`, и `update()`.
+Индекс и триггеры создаёт миграция `0004_news_fts`. Django пересоздаёт
+таблицу SQLite при многих изменениях схемы и при этом теряет
+триггеры: такие миграции должны создать их заново.
+"""
+import re
+
+from .models import News
+
+FTS_TABLE = 'news_news_fts'
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+SEARCH_SQL = f"""
+    SELECT news_news.id, news_news.title, news_news.date, news_news.summary
+    FROM {FTS_TABLE}
+    JOIN news_news ON news_news.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH %s
+    ORDER BY bm25({FTS_TABLE}, %s, %s)
+    LIMIT %s
+"""
+
+
+def to_match_expression(query):
+    """
+    Превращает пользовательский ввод в безопасное выражение MATCH.
+
+    Каждое слово берётся в кавычки, чтобы символы синтаксиса FTS5
+    не ломали запрос, и ищется по префиксу: «новост» найдёт «новости».
+    """
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_news(query, limit):
+    """
+    Новости, подходящие под запрос, от более к менее релевантным.
+
+    Загружаются только поля выдачи, текст новости отложен.
+    """
+    expression = to_match_expression(query)
+    if not expression:
+        return []
+    return list(News.objects.raw(
+        SEARCH_SQL, [expression, TITLE_WEIGHT, TEXT_WEIGHT, limit]
+    ))
@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import moderation
+from .cache import forget_news_pages
+from .models import BannedWord, Comment, News
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_news_pages(sender, instance, signal, **kwargs):
+    """
+    Изменение новости или комментария сбрасывает кэш ленты.
+
+    Комментарий в очереди модерации не виден читателям, и его запись
+    страниц не меняет: после одобрения версию увеличит очередь.
+    """
+    if (
+        sender is Comment
+        and signal is post_save
+        and instance.status == Comment.Status.PENDING
+    ):
+        return
+    forget_news_pages()
+
+
+@receiver(post_save, sender=BannedWord)
+@receiver(post_delete, sender=BannedWord)
+def reload_banned_words(sender, **kwargs):
+    """
+    Процессы пересоберут автомат при следующей проверке.
+
+    Версия меняется только после фиксации: процесс, который прочитал
+    бы новую версию раньше, собрал бы автомат по старому словарю
+    и не пересобрал бы его до следующего изменения.
+    """
+    transaction.on_commit(moderation.bump_version)
@@ -1,16 +1,34 @@
 from django.urls import path
 
-from news import views
+from news import api, views
 
 app_name = 'news'
 
 urlpatterns = [
     path('', views.NewsList.as_view(), name='home'),
-    path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
+    path('feed/', views.NewsFeed.as_view(), name='feed'),
+    path('search/', views.NewsSearch.as_view(), name='search'),
+    path('news/<int:pk>/', views.NewsDetail.as_view(), name='detail'),
+    path(
+        'news/<int:pk>/comments/',
+        views.NewsCommentsFragment.as_view(),
+        name='comments'
+    ),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
         name='delete'
     ),
     path('edit_comment/<int:pk>/', views.CommentUpdate.as_view(), name='edit'),
+    path('api/v1/news/', api.NewsListApi.as_view(), name='api-news'),
+    path(
+        'api/v1/news/<int:pk>/',
+        api.NewsDetailApi.as_view(),
+        name='api-news-detail'
+    ),
+    path(
+        'api/v1/news/<int:pk>/comments/',
+        api.CommentListApi.as_view(),
+        name='api-comments'
+    ),
 ]
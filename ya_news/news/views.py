@@ -1,81 +1,254 @@
+import json
+
 from django.conf import settings
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import AccessMixin, LoginRequiredMixin
+from django.db import transaction
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import (
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
+
+from yanews.ratelimit import RateLimitMixin
+from yanews.replicas import read_from_primary
 
+from .cache import (
+    forget_news_pages,
+    home_page_etag,
+    home_page_key,
+    news_detail_etag,
+    news_detail_last_modified,
+)
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import KeysetPaginator
+from .search import search_news
+
 
+revalidate = (cache_control(private=True, no_cache=True), vary_on_cookie)
 
+
+@method_decorator(revalidate, name='get')
+@method_decorator(condition(etag_func=home_page_etag), name='get')
 class NewsList(generic.ListView):
     """Список новостей."""
     model = News
     template_name = 'news/home.html'
+    context_object_name = 'news_list'
+    replica_reads = True
+
+    cursor_param = 'cursor'
+    # Полный текст новости лента не показывает.
+    list_fields = ('title', 'date', 'summary', 'comment_count')
+
+    def get(self, request, *args, **kwargs):
+        """
+        Анонимным читателям отдаём страницу из кэша.
+
+        Страница одинакова для всех анонимных читателей и меняется
+        только вместе с версией данных ленты.
+        """
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+        key = home_page_key(request.GET.get(self.cursor_param))
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content)
+        # Под ключом версии — только то, что видит основная база.
+        with read_from_primary():
+            response = super().get(request, *args, **kwargs).render()
+        cache.set(key, response.content, settings.NEWS_HOME_CACHE_TIMEOUT)
+        return response
 
     def get_queryset(self):
         """
         Выводим только несколько последних новостей.
 
         Их количество определяется в настройках проекта.
+        Архив листается по курсору на ключе `(-date, id)`.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        page = KeysetPaginator(
+            self.model.objects.only(*self.list_fields),
+            keys=('-date', 'id'),
+            per_page=settings.NEWS_COUNT_ON_HOME_PAGE,
+        ).page(self.request.GET.get(self.cursor_param))
+        self.next_cursor = page.next_cursor
+        return page.object_list
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = self.next_cursor
+        return context
 
 
-class NewsDetail(generic.DetailView):
-    model = News
-    template_name = 'news/detail.html'
+class NewsSearch(generic.ListView):
+    """Поиск по заголовкам и текстам новостей."""
+    template_name = 'news/search.html'
+    context_object_name = 'news_list'
 
-    def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
+    def get_queryset(self):
+        return search_news(
+            self.request.GET.get('q', ''), settings.SEARCH_RESULTS_LIMIT
         )
-        return obj
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        if self.request.user.is_authenticated:
-            context['form'] = CommentForm()
+        context['query'] = self.request.GET.get('q', '')
         return context
 
 
-class NewsComment(
-        LoginRequiredMixin,
-        generic.detail.SingleObjectMixin,
-        generic.FormView
+class NewsFeed(generic.View):
+    """
+    Весь архив новостей в формате NDJSON.
+
+    Строки читаются из базы порциями и сразу отдаются клиенту,
+    поэтому память сервера не зависит от размера архива.
+    """
+    fields = ('id', 'title', 'text', 'date')
+
+    def get(self, request, *args, **kwargs):
+        rows = News.objects.order_by('-date', 'id').values(
+            *self.fields
+        ).iterator(chunk_size=settings.NEWS_FEED_CHUNK_SIZE)
+        return StreamingHttpResponse(
+            (
+                json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+                + '\n'
+                for row in rows
+            ),
+            content_type='application/x-ndjson',
+        )
+
+
+class CommentPageMixin:
+    """
+    Добавляет в контекст первую страницу комментариев к новости.
+
+    Показываются только одобренные комментарии. Они загружаются
+    порциями по ключу `(created, id)`, остальные страницы отдаёт
+    `NewsCommentsFragment`.
+    """
+    cursor_param = 'cursor'
+
+    def get_comments_page(self, news, cursor=None):
+        paginator = KeysetPaginator(
+            Comment.objects.filter(
+                news=news, status=Comment.Status.APPROVED
+            ).select_related('author'),
+            keys=('created', 'id'),
+            per_page=settings.COMMENTS_COUNT_ON_PAGE,
+        )
+        return paginator.page(cursor)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = self.get_comments_page(
+            self.object, self.request.GET.get(self.cursor_param)
+        )
+        context['comments'] = page.object_list
+        context['next_cursor'] = page.next_cursor
+        return context
+
+
+@method_decorator(revalidate, name='get')
+@method_decorator(
+    condition(
+        etag_func=news_detail_etag,
+        last_modified_func=news_detail_last_modified,
+    ),
+    name='get'
+)
+class NewsDetail(
+        AccessMixin,
+        RateLimitMixin,
+        CommentPageMixin,
+        generic.DetailView
 ):
+    """
+    Новость с комментариями и форма нового комментария.
+
+    GET и POST обслуживает один экземпляр представления: новость
+    загружается один раз, а при ошибке формы страница отрисовывается
+    заново с тем же объектом и первой страницей комментариев.
+    """
     model = News
-    form_class = CommentForm
     template_name = 'news/detail.html'
+    form_class = CommentForm
+    ratelimit_scope = 'comments'
+    replica_reads = True
+
+    def get_object(self, queryset=None):
+        obj = get_object_or_404(self.model, pk=self.kwargs['pk'])
+        return obj
+
+    def get_context_data(self, **kwargs):
+        if self.request.user.is_authenticated:
+            kwargs.setdefault('form', self.form_class())
+        return super().get_context_data(**kwargs)
 
     def post(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
         self.object = self.get_object()
-        return super().post(request, *args, **kwargs)
+        form = self.form_class(request.POST)
+        if form.is_valid():
+            return self.form_valid(form)
+        return self.render_to_response(self.get_context_data(form=form))
 
     def form_valid(self, form):
+        """
+        Комментарий уходит в очередь модерации.
+
+        Проверяет его и учитывает в счётчике команда `moderate_comments`.
+        """
         comment = form.save(commit=False)
         comment.news = self.object
         comment.author = self.request.user
+        comment.status = Comment.Status.PENDING
         comment.save()
-        return super().form_valid(form)
+        return HttpResponseRedirect(self.get_success_url())
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
-class NewsDetailView(generic.View):
+class NewsCommentsFragment(CommentPageMixin, generic.View):
+    """Следующая порция комментариев в виде JSON-фрагмента."""
 
     def get(self, request, *args, **kwargs):
-        view = NewsDetail.as_view()
-        return view(request, *args, **kwargs)
+        news = get_object_or_404(News.objects.only('pk'), pk=kwargs['pk'])
+        page = self.get_comments_page(news, request.GET.get(self.cursor_param))
+        html = render_to_string(
+            'includes/comments.html',
+            {'comments': page.object_list},
+            request=request,
+        )
+        return JsonResponse({'html': html, 'next_cursor': page.next_cursor})
 
-    def post(self, request, *args, **kwargs):
-        view = NewsComment.as_view()
-        return view(request, *args, **kwargs)
+
+def unapprove(comment):
+    """
+    Возвращает одобренный комментарий в очередь модерации.
+
+    Условие на статус проверяется в самом UPDATE, поэтому ответ
+    «был одобрен» верен и при параллельной работе модерации.
+    """
+    return Comment.objects.filter(
+        pk=comment.pk, status=Comment.Status.APPROVED
+    ).update(status=Comment.Status.PENDING) > 0
 
 
 class CommentBase(LoginRequiredMixin):
@@ -83,9 +256,14 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
+        """
+        Адрес новости берём из уже загруженного комментария.
+
+        `news_id` хранится в самой строке комментария, так что
+        ни повторного `get_object()`, ни загрузки новости не нужно.
+        """
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
@@ -93,12 +271,42 @@ class CommentBase(LoginRequiredMixin):
         return self.model.objects.filter(author=self.request.user)
 
 
-class CommentUpdate(CommentBase, generic.UpdateView):
+class CommentUpdate(CommentBase, RateLimitMixin, generic.UpdateView):
     """Редактирование комментария."""
     template_name = 'news/edit.html'
     form_class = CommentForm
+    ratelimit_scope = 'comments'
+
+    @transaction.atomic
+    def form_valid(self, form):
+        """
+        Исправленный комментарий заново проходит модерацию.
+
+        Статус загруженного объекта мог устареть: модерация могла
+        одобрить комментарий после его загрузки. Поэтому счётчик
+        уменьшается, только если одобренный комментарий удалось
+        вернуть в очередь в базе.
+        """
+        comment = form.save(commit=False)
+        if unapprove(comment):
+            News.change_comment_count(comment.news_id, -1)
+            # Сохранение комментария в очереди кэш ленты не сбрасывает.
+            forget_news_pages()
+        comment.status = Comment.Status.PENDING
+        return super().form_valid(form)
 
 
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+
+    @transaction.atomic
+    def delete(self, request, *args, **kwargs):
+        """Удаляет комментарий; счётчик — как при редактировании."""
+        self.object = self.get_object()
+        success_url = self.get_success_url()
+        unapproved = unapprove(self.object)
+        self.object.delete()
+        if unapproved:
+            News.change_comment_count(self.object.news_id, -1)
+        return HttpResponseRedirect(success_url)
@@ -0,0 +1,152 @@
+"""
+Учёт стоимости запросов к представлениям.
+
+`QueryBudgetMiddleware` считает для каждого запроса число SQL-запросов,
+время работы с базой и время рендеринга шаблона, привязывая их к имени
+URL (`news:home`). Бюджеты задаются в настройке `VIEW_BUDGETS`:
+
+    VIEW_BUDGETS = {'news:home': {'queries': 4, 'db_time': 0.05}}
+
+В работе превышение бюджета только пишется в лог, а в тестах
+`view_budget()` и `ViewBudgetTestMixin` превращают его в падение теста.
+"""
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+LIMITS = ('queries', 'db_time', 'render_time', 'total_time')
+TRANSACTION_STATEMENTS = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO')
+
+_collectors = []
+
+
+class BudgetExceeded(AssertionError):
+    """Представление вышло за объявленный бюджет."""
+
+
+class ViewStats:
+    """Стоимость одного запроса к представлению."""
+
+    def __init__(self, path):
+        self.path = path
+        self.url_name = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обёртка `execute_wrapper`: считает запросы и их время."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            # Точки сохранения есть только внутри тестовых транзакций,
+            # в боевом режиме их нет, поэтому в бюджет они не входят.
+            if not sql.startswith(TRANSACTION_STATEMENTS):
+                self.queries += 1
+                self.db_time += time.perf_counter() - start
+
+    def __repr__(self):
+        return (
+            f'<ViewStats {self.url_name or self.path}: '
+            f'{self.queries} queries, db {self.db_time * 1000:.1f} ms, '
+            f'render {self.render_time * 1000:.1f} ms, '
+            f'total {self.total_time * 1000:.1f} ms>'
+        )
+
+
+def get_budget(url_name, budgets=None):
+    """Бюджет представления: из `budgets`, иначе из настроек."""
+    declared = dict(getattr(settings, 'VIEW_BUDGETS', {}).get(url_name, {}))
+    if budgets:
+        declared.update(budgets.get(url_name, {}))
+    return declared
+
+
+def over_budget(stats, budget):
+    """Возвращает список превышений бюджета; пустой, если всё в норме."""
+    return [
+        f'{stats.url_name}: {limit} = {getattr(stats, limit):g} '
+        f'> {budget[limit]:g}'
+        for limit in LIMITS
+        if limit in budget and getattr(stats, limit) > budget[limit]
+    ]
+
+
+class QueryBudgetMiddleware:
+    """Замеряет стоимость каждого запроса и сверяет её с бюджетом."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = ViewStats(request.path)
+        request.view_stats = stats
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        stats.total_time = time.perf_counter() - start
+        if request.resolver_match is not None:
+            stats.url_name = request.resolver_match.view_name
+        for collected in _collectors:
+            collected.append(stats)
+        errors = over_budget(stats, get_budget(stats.url_name))
+        if errors:
+            logger.warning('View over budget: %s', '; '.join(errors))
+        else:
+            logger.debug('%r', stats)
+        return response
+
+    def process_template_response(self, request, response):
+        stats = request.view_stats
+        start = time.perf_counter()
+
+        def finish(response):
+            stats.render_time = time.perf_counter() - start
+
+        response.add_post_render_callback(finish)
+        return response
+
+
+@contextmanager
+def view_budget(budgets=None):
+    """
+    Собирает статистику запросов внутри блока и проверяет бюджеты.
+
+    `budgets` дополняет и переопределяет `VIEW_BUDGETS` для этого блока.
+    При превышении выбрасывается `BudgetExceeded`.
+    """
+    collected = []
+    _collectors.append(collected)
+    try:
+        yield collected
+    finally:
+        _collectors.remove(collected)
+    errors = []
+    for stats in collected:
+        errors += over_budget(stats, get_budget(stats.url_name, budgets))
+    if errors:
+        raise BudgetExceeded('\n'.join(errors))
+
+
+class ViewBudgetTestMixin:
+    """
+    Примесь к `TestCase`: каждый тест проверяется на бюджеты представлений.
+
+    Дополнительные бюджеты для класса задаются в `view_budgets`.
+    """
+    view_budgets = None
+
+    def setUp(self):
+        super().setUp()
+        budget = view_budget(self.view_budgets)
+        self.view_stats = budget.__enter__()
+        self.addCleanup(budget.__exit__, None, None, None)
@@ -0,0 +1,175 @@
+"""
+Pytest-плагин замеров производительности.
+
+Подключается импортом фикстуры и хуков в `benchmarks/conftest.py`.
+Фикстура `benchmark(func, *args, **kwargs)` вызывает `func`
+`--bench-rounds` раз (медленную — пока не выйдет `--bench-max-time`,
+но не меньше `MIN_ROUNDS`) и запоминает время каждого вызова.
+
+Лучшее время, выраженное в единицах эталонной работы `calibrate()`,
+сравнивается с базовым из `benchmarks/baseline.json`: если оно хуже
+больше чем на `--bench-tolerance`, тест падает. Все замеры прогона
+пишутся в `benchmarks/results.json`.
+
+    pytest benchmarks
+    pytest benchmarks --bench-save-baseline   # обновить базовую линию
+"""
+import gc
+import json
+import platform
+import statistics
+import time
+from pathlib import Path
+
+import django
+import pytest
+
+RESULTS_KEY = pytest.StashKey[dict]()
+MIN_ROUNDS = 5
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('bench', 'замеры производительности')
+    group.addoption(
+        '--bench-rounds',
+        type=int,
+        default=50,
+        help='Сколько раз вызывать замеряемую функцию.',
+    )
+    group.addoption(
+        '--bench-max-time',
+        type=float,
+        default=2.0,
+        help='После стольких секунд медленный замер останавливается.',
+    )
+    group.addoption(
+        '--bench-tolerance',
+        type=float,
+        default=1.0,
+        help='Допустимое замедление: 1.0 — вдвое медленнее базового.',
+    )
+    group.addoption('--bench-baseline', default='benchmarks/baseline.json')
+    group.addoption('--bench-json', default='benchmarks/results.json')
+    group.addoption(
+        '--bench-save-baseline',
+        action='store_true',
+        help='Записать замеры прогона как новую базовую линию.',
+    )
+
+
+def _path(config, option):
+    return Path(config.rootpath, config.getoption(option))
+
+
+def load_baseline(config):
+    path = _path(config, 'bench_baseline')
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8'))['benchmarks']
+
+
+def calibrate(rounds=50):
+    """
+    Лучшее время эталонной работы на чистом Python.
+
+    Замеры сравниваются в единицах этого времени, поэтому общее
+    замедление машины (соседи, частота процессора) не считается
+    регрессией, а базовая линия переносится между машинами.
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        sorted(str(number) for number in range(5000))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def summarize(timings, calibration):
+    return {
+        'rounds': len(timings),
+        'calibration': calibration,
+        'relative': min(timings) / calibration,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'max': max(timings),
+    }
+
+
+def check_regression(name, stats, baseline, tolerance):
+    """
+    Падает, если лучшее время хуже базового больше чем на `tolerance`.
+
+    Сравнивается минимум, а не медиана: медиану сдвигают соседние
+    процессы и сборщик мусора, а минимум показывает цену самого кода.
+    Минимум берётся в единицах `calibrate()`.
+    """
+    if name not in baseline:
+        return
+    limit = baseline[name]['relative'] * (1 + tolerance)
+    assert stats['relative'] <= limit, (
+        f'{name}: {stats["relative"]:.1f} эталонов '
+        f'({stats["min"] * 1000:.2f} мс) против базовых '
+        f'{baseline[name]["relative"]:.1f}, хуже больше чем '
+        f'на {tolerance:.0%}'
+    )
+
+
+@pytest.fixture
+def benchmark(request):
+    """Замеряет вызовы функции; имя замера — имя теста."""
+    config = request.config
+
+    def run(func, *args, **kwargs):
+        # Первый вызов прогревает кэши шаблонов, URL и соединение.
+        result = func(*args, **kwargs)
+        timings = []
+        # Сборка мусора посреди вызова — шум, а не свойство кода.
+        gc.disable()
+        try:
+            calibration = calibrate()
+            deadline = time.perf_counter() + config.getoption('bench_max_time')
+            for _ in range(config.getoption('bench_rounds')):
+                start = time.perf_counter()
+                result = func(*args, **kwargs)
+                timings.append(time.perf_counter() - start)
+                if len(timings) >= MIN_ROUNDS and start > deadline:
+                    break
+        finally:
+            gc.enable()
+        stats = summarize(timings, calibration)
+        config.stash.setdefault(RESULTS_KEY, {})[request.node.name] = stats
+        if not config.getoption('bench_save_baseline'):
+            check_regression(
+                request.node.name,
+                stats,
+                load_baseline(config),
+                config.getoption('bench_tolerance'),
+            )
+        return result
+
+    return run
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    results = config.stash.get(RESULTS_KEY, None)
+    if not results:
+        return
+    report = {
+        'machine': platform.platform(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'benchmarks': dict(sorted(results.items())),
+    }
+    write_report(_path(config, 'bench_json'), report)
+    if config.getoption('bench_save_baseline'):
+        # Прогон части замеров не стирает базовую линию остальных.
+        report['benchmarks'] = dict(sorted(
+            {**load_baseline(config), **results}.items()
+        ))
+        write_report(_path(config, 'bench_baseline'), report)
+
+
+def write_report(path, report):
+    path.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
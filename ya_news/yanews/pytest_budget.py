@@ -0,0 +1,18 @@
+"""
+Pytest-плагин бюджетов представлений.
+
+Подключается импортом фикстуры в conftest.py. Каждый тест проверяется
+на бюджеты из `VIEW_BUDGETS`; для отдельного теста их можно уточнить
+маркером `@pytest.mark.view_budget({'news:home': {'queries': 2}})`.
+"""
+import pytest
+
+from .budget import view_budget
+
+
+@pytest.fixture(autouse=True)
+def view_stats(request):
+    """Статистика запросов к представлениям, сделанных тестом."""
+    marker = request.node.get_closest_marker('view_budget')
+    with view_budget(marker.args[0] if marker else None) as collected:
+        yield collected
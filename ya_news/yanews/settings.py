@@ -21,11 +21,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'yanews.budget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'yanews.auth.CachedAuthenticationMiddleware',
+    'yanews.replicas.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -53,8 +55,31 @@ WSGI_APPLICATION = 'yanews.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'yanews.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {'timeout': 20},
+        # Тестовая база в файле: в памяти SQLite не даёт проверить
+        # параллельную запись из нескольких потоков.
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+    },
+    # При разработке реплика — тот же файл, и чтения с неё не
+    # переключаются (см. yanews/replicas.py). В работе здесь копия
+    # основной базы.
+    'replica': {
+        'ENGINE': 'yanews.sqlite',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {'timeout': 20},
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['yanews.replicas.ReplicaRouter']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
@@ -80,3 +105,45 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_COUNT_ON_PAGE = 20
+
+NEWS_FEED_CHUNK_SIZE = 500
+
+NEWS_HOME_CACHE_TIMEOUT = 60 * 15
+
+SEARCH_RESULTS_LIMIT = 50
+
+API_PAGE_SIZE = 20
+
+# Сессия читается из кэша, в базу — только при промахе. Профиль без
+# базы вовсе: 'django.contrib.sessions.backends.signed_cookies'.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+USER_CACHE_TIMEOUT = 60
+
+USER_CACHE_SIZE = 10000
+
+REPLICA_DATABASE = 'replica'
+
+REPLICA_PIN_SECONDS = 5
+
+# Ведро токенов на запись, см. yanews/ratelimit.py.
+RATE_LIMITS = {
+    'comments': {'requests': 10, 'period': 60},
+}
+
+# Бюджеты представлений с учётом чтения сессии и пользователя,
+# см. yanews/budget.py. Запись комментария включает однократную
+# загрузку словаря запрещённых слов после его изменения, правка
+# одобренного комментария — ещё и сдвиг счётчика.
+VIEW_BUDGETS = {
+    'news:home': {'queries': 3},
+    'news:detail': {'queries': 5},
+    'news:comments': {'queries': 2},
+    'news:edit': {'queries': 7},
+    'news:delete': {'queries': 6},
+    'news:api-news': {'queries': 1},
+    'news:api-news-detail': {'queries': 1},
+    'news:api-comments': {'queries': 2},
+}
@@ -0,0 +1,24 @@
+"""
+Профиль развёртывания под ASGI.
+
+Главная и страница новости обслуживаются асинхронными версиями
+(см. `news/async_views.py`), остальные адреса — прежними CBV.
+Один рабочий процесс держит открытыми тысячи медленных соединений:
+
+    uvicorn yanews.asgi:application --workers 1
+
+`QueryBudgetMiddleware` умеет работать только синхронно, и Django
+выполнял бы ради неё каждый запрос в отдельном потоке, поэтому
+в этом профиле учёт бюджетов отключён: бюджеты проверяют тесты
+синхронного профиля. `ReplicaMiddleware` работает в цикле событий
+и остаётся: асинхронные страницы тоже читают с реплики.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import MIDDLEWARE
+
+ROOT_URLCONF = 'yanews.urls_asgi'
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware != 'yanews.budget.QueryBudgetMiddleware'
+]
@@ -0,0 +1,17 @@
+"""Адреса ASGI-профиля: страницы чтения заменены асинхронными версиями."""
+from django.urls import include, path
+
+from news import async_views
+from news.urls import app_name, urlpatterns as news_urlpatterns
+
+from .urls import urlpatterns as sync_urlpatterns
+
+news_patterns = [
+    path('', async_views.news_list, name='home'),
+    path('news/<int:pk>/', async_views.news_detail, name='detail'),
+] + news_urlpatterns
+
+urlpatterns = [path('', include((news_patterns, app_name)))] + [
+    pattern for pattern in sync_urlpatterns
+    if getattr(pattern, 'namespace', None) != app_name
+]
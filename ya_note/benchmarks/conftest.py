@@ -0,0 +1,27 @@
+import pytest
+from django.test.client import Client
+
+from yanote.pytest_bench import (  # noqa: F401
+    benchmark,
+    pytest_addoption,
+    pytest_sessionfinish,
+)
+
+
+@pytest.fixture(autouse=True)
+def production(settings):
+    """Условия работы: без ограничения частоты."""
+    settings.DEBUG = False
+    settings.RATE_LIMITS = {}
+
+
+@pytest.fixture
+def author(django_user_model):
+    return django_user_model.objects.create(username='author')
+
+
+@pytest.fixture
+def author_client(author):
+    client = Client()
+    client.force_login(author)
+    return client
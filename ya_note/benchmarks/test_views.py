@@ -0,0 +1,78 @@
+"""
+Замеры горячих путей YaNote через тестовый клиент.
+
+Запускаются отдельно от проверок корректности:
+
+    pytest benchmarks
+"""
+from http import HTTPStatus
+from itertools import count
+
+import pytest
+from django.conf import settings
+from django.urls import reverse
+
+from notes.models import Note
+
+NOTES_IN_LIST = 50000
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def many_notes(author):
+    Note.objects.bulk_create(
+        Note(
+            title=f'Заметка {index}',
+            text='Текст заметки.',
+            slug=f'note-{index}',
+            author=author,
+        )
+        for index in range(NOTES_IN_LIST)
+    )
+
+
+def test_list_50k_notes(benchmark, author_client, many_notes):
+    url = reverse('notes:list')
+    response = benchmark(author_client.get, url)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_list_50k_notes_last_page(benchmark, author_client, many_notes):
+    url = reverse('notes:list')
+    last_page = NOTES_IN_LIST // settings.NOTES_LIST_PAGE_SIZE
+    response = benchmark(author_client.get, url, {'page': last_page})
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_list_50k_notes_after_write(benchmark, author, author_client,
+                                    many_notes):
+    url = reverse('notes:list')
+    numbers = count()
+
+    def write_and_list():
+        Note.objects.create(
+            title='Новая заметка',
+            text='Текст заметки.',
+            slug=f'new-{next(numbers)}',
+            author=author,
+        )
+        return author_client.get(url)
+
+    response = benchmark(write_and_list)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_note_create(benchmark, author_client, many_notes):
+    url = reverse('notes:add')
+    numbers = count()
+
+    def create():
+        return author_client.post(url, {
+            'title': 'Новая заметка',
+            'text': 'Текст заметки.',
+            'slug': f'new-{next(numbers)}',
+        })
+
+    response = benchmark(create)
+    assert response.status_code == HTTPStatus.FOUND
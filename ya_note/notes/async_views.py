@@ -0,0 +1,79 @@
+"""
+Асинхронные версии страниц чтения для ASGI-профиля.
+
+Запросы к базе выполняют те же классы `NotesList` и `NoteDetail`,
+но все обращения одной страницы собраны в одну функцию и выполняются
+одним переходом `sync_to_async(thread_sensitive=True)`. Сессия,
+пользователь и заметки загружаются там же, поэтому шаблон рисуется
+уже в цикле событий и к базе не обращается.
+"""
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponseNotAllowed
+from django.template.response import TemplateResponse
+
+from .views import NoteDetail, NotesList
+
+# Результат синхронной части: готовый ответ (переход на страницу
+# входа) либо контекст для шаблона.
+Prepared = namedtuple('Prepared', ('response', 'context'))
+
+
+def _prepare(view_class, request, **kwargs):
+    view = view_class()
+    view.setup(request, **kwargs)
+    if not request.user.is_authenticated:
+        return view, redirect_to_login(request.get_full_path())
+    return view, None
+
+
+def _finish(request, template_name, prepared):
+    if prepared.response is not None:
+        return prepared.response
+    response = TemplateResponse(request, template_name, prepared.context)
+    return response.render()
+
+
+@sync_to_async(thread_sensitive=True)
+def _list_page(request):
+    """Всё, что списку заметок нужно от базы, за один переход."""
+    view, response = _prepare(NotesList, request)
+    if response is not None:
+        return Prepared(response, None)
+    view.object_list = view.get_queryset()
+    context = view.get_context_data()
+    # Вычисляем страницу здесь: в цикле событий запросы к базе запрещены.
+    len(context['object_list'])
+    return Prepared(None, context)
+
+
+async def notes_list(request):
+    """Асинхронная версия `NotesList`."""
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(('GET', 'HEAD'))
+    prepared = await _list_page(request)
+    return _finish(request, NotesList.template_name, prepared)
+
+
+@sync_to_async(thread_sensitive=True)
+def _detail_page(request, slug):
+    """Всё, что странице заметки нужно от базы, за один переход."""
+    view, response = _prepare(NoteDetail, request, slug=slug)
+    if response is not None:
+        return Prepared(response, None)
+    view.object = view.get_object()
+    return Prepared(None, view.get_context_data(object=view.object))
+
+
+async def note_detail(request, slug):
+    """Асинхронная версия `NoteDetail`."""
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(('GET', 'HEAD'))
+    prepared = await _detail_page(request, slug)
+    return _finish(request, NoteDetail.template_name, prepared)
+
+
+notes_list.replica_reads = NotesList.replica_reads
+note_detail.replica_reads = NoteDetail.replica_reads
@@ -0,0 +1,206 @@
+"""
+Массовый импорт и экспорт заметок в форматах NDJSON и CSV.
+
+Строки проверяются по правилам `NoteForm`, но уникальность slug
+проверяется не запросом на каждую строку, а пачкой: одним запросом
+на порцию строк. Все порции вставляются `bulk_create` в одной
+транзакции: импорт либо проходит целиком, либо не меняет ничего.
+
+Транзакция пишущая (`BEGIN IMMEDIATE`) и держит блокировку SQLite,
+поэтому открывается только после того, как все строки прочитаны
+и проверены формой: медленный клиент не останавливает остальные
+записи, а в транзакции остаются лишь запросы slug и вставка.
+"""
+import csv
+import json
+from itertools import islice
+from operator import itemgetter
+
+from django.db import transaction
+
+from .forms import WARNING, NoteForm
+from .models import Note
+from .slugs import make_slug, pick_free_slug, taken_slugs
+
+FORMATS = ('ndjson', 'csv')
+EXPORT_FIELDS = ('title', 'text', 'slug')
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportFailed(Exception):
+    """Импорт отменён: часть строк не прошла проверку."""
+
+    def __init__(self, errors):
+        super().__init__(f'Строк с ошибками: {len(errors)}')
+        self.errors = errors
+
+
+class NoteImportForm(NoteForm):
+    """
+    `NoteForm` без проверок уникальности.
+
+    Уникальность slug для всей порции строк проверяет `import_notes`.
+    """
+
+    def clean_slug(self):
+        return self.cleaned_data.get('slug') or ''
+
+    def validate_unique(self):
+        pass
+
+
+def read_rows(lines, fmt):
+    """Превращает строки текста в словари полей заметки."""
+    if fmt == 'csv':
+        yield from csv.DictReader(lines)
+        return
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        if not isinstance(row, dict):
+            raise ValueError(f'Строка {number}: ожидается объект JSON.')
+        yield row
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class SlugAllocator:
+    """Раздаёт slug сразу для пачки заметок одного импорта."""
+
+    def __init__(self):
+        self.max_length = Note._meta.get_field('slug').max_length
+        self.taken = set()
+        self.checked_bases = set()
+
+    def reserve_explicit(self, slugs):
+        """Возвращает уже занятые из явно указанных slug."""
+        busy = set(
+            Note.objects.filter(slug__in=slugs).values_list('slug', flat=True)
+        )
+        busy |= self.taken & set(slugs)
+        self.taken |= set(slugs) - busy
+        return busy
+
+    def assign(self, notes):
+        """Подбирает slug заметкам без него, по запросу на порцию."""
+        bases = [
+            (note, make_slug(note.title, self.max_length)) for note in notes
+        ]
+        self.taken |= set(
+            Note.objects.filter(
+                slug__in={base for _, base in bases}
+            ).values_list('slug', flat=True)
+        )
+        for note, base in bases:
+            if base in self.taken and base not in self.checked_bases:
+                # Редкий случай совпадения: дочитываем варианты base-N.
+                self.taken |= taken_slugs(
+                    Note.objects.all(), base, self.max_length
+                )
+                self.checked_bases.add(base)
+            note.slug = pick_free_slug(base, self.taken, self.max_length)
+            self.taken.add(note.slug)
+
+
+def _validate_rows(rows, author, errors):
+    """Проверяет строки формой; возвращает пары (номер, заметка)."""
+    notes, explicit = [], set()
+    for number, row in enumerate(rows, start=1):
+        form = NoteImportForm(row)
+        if not form.is_valid():
+            errors.append({'row': number, 'errors': {
+                field: list(messages)
+                for field, messages in form.errors.items()
+            }})
+            continue
+        note = form.save(commit=False)
+        note.author = author
+        if note.slug in explicit:
+            errors.append(
+                {'row': number, 'errors': {'slug': [note.slug + WARNING]}}
+            )
+            continue
+        if note.slug:
+            explicit.add(note.slug)
+        notes.append((number, note))
+    return notes
+
+
+def _allocate_chunk(chunk, allocator, errors):
+    explicit = {note.slug: number for number, note in chunk if note.slug}
+    busy = allocator.reserve_explicit(list(explicit))
+    errors.extend(
+        {'row': explicit[slug], 'errors': {'slug': [slug + WARNING]}}
+        for slug in busy
+    )
+    allocator.assign([note for _, note in chunk if not note.slug])
+    return [note for _, note in chunk]
+
+
+def import_notes(author, rows, batch_size=1000):
+    """
+    Импортирует заметки автора из последовательности словарей.
+
+    Возвращает число созданных заметок. Если хоть одна строка
+    не прошла проверку, транзакция откатывается и выбрасывается
+    `ImportFailed` со списком ошибок по номерам записей.
+    """
+    allocator = SlugAllocator()
+    errors = []
+    created = 0
+    validated = _validate_rows(rows, author, errors)
+    with transaction.atomic():
+        for chunk in _chunks(validated, batch_size):
+            notes = _allocate_chunk(chunk, allocator, errors)
+            if not errors:
+                Note.objects.bulk_create(notes, batch_size=batch_size)
+                created += len(notes)
+        if errors:
+            transaction.set_rollback(True)
+    if errors:
+        errors.sort(key=itemgetter('row'))
+        raise ImportFailed(errors[:MAX_REPORTED_ERRORS])
+    return created
+
+
+def export_rows(queryset, fmt, chunk_size=1000):
+    """Построчно сериализует заметки, не загружая их все в память."""
+    rows = queryset.order_by('pk').values(*EXPORT_FIELDS).iterator(
+        chunk_size=chunk_size
+    )
+    if fmt == 'csv':
+        buffer = _LineBuffer()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        yield buffer.pop()
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.pop()
+        return
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+class _LineBuffer:
+    """Файлоподобный объект, из которого забираются строки csv.writer."""
+
+    def __init__(self):
+        self.value = ''
+
+    def write(self, value):
+        self.value += value
+
+    def pop(self):
+        value, self.value = self.value, ''
+        return value
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.bulk import FORMATS, export_rows
+from notes.models import Note
+
+
+class Command(BaseCommand):
+    help = 'Выгружает заметки пользователя в NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--author', required=True, help='Имя автора.')
+        parser.add_argument('--format', choices=FORMATS, default='ndjson')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.NOTES_EXPORT_CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            author = get_user_model().objects.get(username=options['author'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'Пользователь {options["author"]} не найден.')
+        for line in export_rows(
+            Note.objects.filter(author=author),
+            options['format'],
+            chunk_size=options['chunk_size'],
+        ):
+            self.stdout.write(line, ending='')
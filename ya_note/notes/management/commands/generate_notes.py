@@ -0,0 +1,158 @@
+import random
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from notes.models import Note
+
+USER_PREFIX = 'load_'
+
+SYLLABLES = (
+    'ва', 'ло', 'ми', 'ра', 'те', 'но', 'ки', 'су', 'да', 'пе', 'ро', 'жи',
+    'ла', 'ны', 'го', 'бе', 'ст', 'ко', 'ре', 'ти',
+)
+
+
+def make_word(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_text(rng, words):
+    return ' '.join(make_word(rng) for _ in range(words)).capitalize() + '.'
+
+
+def heavy_tailed_counts(rng, size, total, alpha):
+    """
+    Делит `total` на `size` частей с распределением Парето.
+
+    У большинства пользователей несколько заметок, у немногих
+    активных — тысячи.
+    """
+    weights = [rng.paretovariate(alpha) for _ in range(size)]
+    scale = total / sum(weights)
+    return [int(weight * scale) for weight in weights]
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def next_user_number():
+    """Номер, с которого продолжаются имена `load_N`."""
+    names = get_user_model().objects.filter(
+        username__regex=rf'^{USER_PREFIX}[0-9]+$'
+    ).values_list('username', flat=True)
+    return max(
+        (int(name[len(USER_PREFIX):]) for name in names), default=-1
+    ) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу пользователями и заметками '
+        'для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--notes', type=int, default=100000)
+        parser.add_argument(
+            '--alpha',
+            type=float,
+            default=1.2,
+            help='Параметр Парето: чем меньше, тем тяжелее хвост.',
+        )
+        parser.add_argument('--password', default='load-password')
+        parser.add_argument(
+            '--prefix',
+            default='load',
+            help='Начало slug созданных заметок.',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        # Одна транзакция: прерванный запуск не оставляет половины данных.
+        with transaction.atomic():
+            user_ids = self.create_users(
+                options['users'], options['password']
+            )
+            self.create_notes(
+                user_ids, options['notes'], options['alpha'], options['prefix']
+            )
+        self.stdout.write(self.style.SUCCESS('Готово.'))
+
+    @staticmethod
+    def last_pk(model):
+        return model.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+
+    def insert(self, model, objects):
+        """Вставляет порциями; возвращает число строк."""
+        created = 0
+        for chunk in chunks(objects, self.batch_size):
+            model.objects.bulk_create(chunk)
+            created += len(chunk)
+        return created
+
+    def create_users(self, count, password):
+        User = get_user_model()
+        start = next_user_number()
+        last_pk = self.last_pk(User)
+        # Хэш считается один раз: он медленный намеренно.
+        password = make_password(password)
+        self.insert(User, (
+            User(username=f'{USER_PREFIX}{start + i}', password=password)
+            for i in range(count)
+        ))
+        # `bulk_create` на SQLite ключей не возвращает.
+        ids = list(
+            User.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk', flat=True
+            )
+        )
+        self.stdout.write(
+            f'Пользователи: {len(ids)} ({USER_PREFIX}{start}…'
+            f'{USER_PREFIX}{start + count - 1}); для load_driver.py: '
+            f'--first-user {start} --users {count}'
+        )
+        return ids
+
+    def create_notes(self, user_ids, total, alpha, prefix):
+        counts = heavy_tailed_counts(self.rng, len(user_ids), total, alpha)
+        # Номер в slug продолжает ключи таблицы, поэтому повторный
+        # запуск не пересекается с заметками предыдущего.
+        number = self.last_pk(Note)
+
+        def notes():
+            nonlocal number
+            for author_id, count in zip(user_ids, counts):
+                for _ in range(count):
+                    number += 1
+                    title = make_text(self.rng, self.rng.randint(1, 5))
+                    yield Note(
+                        title=title[:100],
+                        text=' '.join(
+                            make_text(self.rng, self.rng.randint(5, 15))
+                            for _ in range(self.rng.randint(1, 6))
+                        ),
+                        slug=f'{prefix}-{number}',
+                        author_id=author_id,
+                    )
+
+        created = self.insert(Note, notes())
+        self.stdout.write(
+            f'Заметки: {created}, больше всего у одного автора: '
+            f'{max(counts, default=0)}'
+        )
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.bulk import FORMATS, ImportFailed, import_notes, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Импортирует заметки пользователя из файла NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path)
+        parser.add_argument('--author', required=True, help='Имя автора.')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Формат файла; по умолчанию определяется по расширению.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.NOTES_IMPORT_BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or (
+            'csv' if path.suffix.lower() == '.csv' else 'ndjson'
+        )
+        try:
+            author = get_user_model().objects.get(username=options['author'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'Пользователь {options["author"]} не найден.')
+        with path.open(encoding='utf-8', newline='') as source:
+            try:
+                created = import_notes(
+                    author,
+                    read_rows(source, fmt),
+                    batch_size=options['batch_size'],
+                )
+            except ImportFailed as error:
+                for row_error in error.errors:
+                    self.stderr.write(str(row_error))
+                raise CommandError(str(error))
+            except ValueError as error:
+                raise CommandError(str(error))
+        self.stdout.write(self.style.SUCCESS(f'Создано заметок: {created}'))
@@ -1,7 +1,9 @@
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
 
-from pytils.translit import slugify
+from .slugs import make_slug, pick_free_slug, taken_slugs
+
+SLUG_ATTEMPTS = 5
 
 
 class Note(models.Model):
@@ -26,13 +28,39 @@ class Note(models.Model):
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        # Поиск по автору обслуживает составной индекс (author_id, id).
+        db_index=False,
     )
 
+    class Meta:
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_id_idx'),
+        )
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        """
+        Если slug не задан, подбирает свободный по заголовку.
+
+        Вместо проверки перед вставкой полагаемся на уникальный индекс:
+        если параллельная запись заняла тот же slug, подбираем заново.
+        """
+        if self.slug:
+            return super().save(*args, **kwargs)
+        max_slug_length = self._meta.get_field('slug').max_length
+        base = make_slug(self.title, max_slug_length)
+        others = Note.objects.exclude(pk=self.pk)
+        for attempt in range(SLUG_ATTEMPTS):
+            self.slug = pick_free_slug(
+                base, taken_slugs(others, base, max_slug_length),
+                max_slug_length
+            )
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                self.slug = ''
+                if attempt == SLUG_ATTEMPTS - 1:
+                    raise
@@ -0,0 +1,52 @@
+"""
+Полнотекстовый поиск по заметкам на SQLite FTS5.
+
+Индекс `notes_note_fts` хранит только токены заголовка и текста и
+ссылается на `notes_note` как на внешнее содержимое. Синхронизацию
+ведут триггеры базы, поэтому индекс видит и `bulk_create`, и `update()`.
+Индекс и триггеры создаёт миграция `0003_note_fts`. Django пересоздаёт
+таблицу SQLite при многих изменениях схемы и при этом теряет
+триггеры: такие миграции должны создать их заново.
+"""
+import re
+
+from .models import Note
+
+FTS_TABLE = 'notes_note_fts'
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+SEARCH_SQL = f"""
+    SELECT notes_note.id, notes_note.slug, notes_note.title
+    FROM {FTS_TABLE}
+    JOIN notes_note ON notes_note.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH %s AND notes_note.author_id = %s
+    ORDER BY bm25({FTS_TABLE}, %s, %s)
+    LIMIT %s
+"""
+
+
+def to_match_expression(query):
+    """
+    Превращает пользовательский ввод в безопасное выражение MATCH.
+
+    Каждое слово берётся в кавычки, чтобы символы синтаксиса FTS5
+    не ломали запрос, и ищется по префиксу: «замет» найдёт «заметки».
+    """
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_notes(author, query, limit):
+    """
+    Заметки автора под запрос, от более к менее релевантным.
+
+    Загружаются только поля выдачи, текст заметки отложен.
+    """
+    expression = to_match_expression(query)
+    if not expression:
+        return []
+    return list(Note.objects.raw(
+        SEARCH_SQL,
+        [expression, author.pk, TITLE_WEIGHT, TEXT_WEIGHT, limit]
+    ))
@@ -0,0 +1,55 @@
+"""
+Подбор уникальных slug для заметок.
+
+Заголовок транслитерируется один раз, а занятые варианты `base`,
+`base-2`, `base-3`... читаются одним запросом по префиксу. Окончательно
+уникальность гарантирует уникальный индекс: при гонке вставка падает
+с `IntegrityError` и slug подбирается заново.
+"""
+from django.db.models import Q
+from pytils.translit import slugify
+
+DEFAULT_SLUG = 'note'
+# Сколько символов держим в запасе под суффикс вида `-123456789`.
+SUFFIX_RESERVE = 10
+
+
+def make_slug(title, max_length):
+    """Транслитерирует заголовок в slug допустимой длины."""
+    return slugify(title or '')[:max_length] or DEFAULT_SLUG
+
+
+def taken_slugs(queryset, base, max_length):
+    """
+    Занятые slug, которые могут совпасть с вариантами `base`.
+
+    Короткому `base` суффикс не укорачивает, и варианты — это только
+    `base` и `base-N`: иначе для `note` читались бы и все `notebook-*`.
+    Длинный `base` суффикс обрезает, поэтому читается всё с префиксом,
+    который суффикс не трогает.
+
+    Префикс записан диапазоном, а не `LIKE 'base%'`: в SQLite LIKE
+    регистронезависим и не использует индекс, а диапазон идёт
+    по уникальному индексу slug. Символ `~` больше любого символа slug.
+    """
+    if len(base) <= max_length - SUFFIX_RESERVE:
+        condition = Q(slug=base) | Q(
+            slug__gte=base + '-', slug__lt=base + '-~'
+        )
+    else:
+        prefix = base[:max_length - SUFFIX_RESERVE]
+        condition = Q(slug__gte=prefix, slug__lt=prefix + '~')
+    return set(queryset.filter(condition).values_list('slug', flat=True))
+
+
+def pick_free_slug(base, taken, max_length):
+    """Первый свободный вариант из `base`, `base-2`, `base-3`..."""
+    if base not in taken:
+        return base
+    number = 2
+    while True:
+        suffix = f'-{number}'
+        candidate = base[:max_length - len(suffix)] + suffix
+        if candidate not in taken:
+            return candidate
+        number += 1
@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from notes.models import Note
+from yanote import settings_asgi
+
+User = get_user_model()
+
+
+@override_settings(
+    ROOT_URLCONF=settings_asgi.ROOT_URLCONF,
+    MIDDLEWARE=settings_asgi.MIDDLEWARE,
+)
+class TestAsyncViews(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Подготовка данных для проверки асинхронных страниц."""
+        cls.note_author = User.objects.create(username='note_author')
+        cls.other_user = User.objects.create(username='other_user')
+        cls.note = Note.objects.create(
+            title='Sample Title',
+            text='Sample Text',
+            slug='sample-slug',
+            author=cls.note_author
+        )
+        cls.list_url = reverse('notes:list')
+        cls.detail_url = reverse('notes:detail', args=(cls.note.slug,))
+
+    def setUp(self):
+        self.author_client = AsyncClient()
+        self.author_client.force_login(self.note_author)
+        self.other_user_client = AsyncClient()
+        self.other_user_client.force_login(self.other_user)
+
+    async def test_notes_list(self):
+        """Проверяет, что асинхронный список показывает только свои заметки."""
+        for client, note_in_list in (
+            (self.author_client, True),
+            (self.other_user_client, False),
+        ):
+            with self.subTest(note_in_list=note_in_list):
+                response = await client.get(self.list_url)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                ids = [row.id for row in response.context['object_list']]
+                self.assertEqual(self.note.id in ids, note_in_list)
+
+    async def test_note_detail(self):
+        """Проверяет, что чужая заметка недоступна и в ASGI-профиле."""
+        for client, status in (
+            (self.author_client, HTTPStatus.OK),
+            (self.other_user_client, HTTPStatus.NOT_FOUND),
+        ):
+            with self.subTest(status=status):
+                response = await client.get(self.detail_url)
+                self.assertEqual(response.status_code, status)
+
+    async def test_anonymous_redirected_to_login(self):
+        """Проверяет, что аноним отправляется на страницу входа."""
+        login_url = reverse('users:login')
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertRedirects(
+                    response,
+                    f'{login_url}?next={url}',
+                    fetch_redirect_response=False,
+                )
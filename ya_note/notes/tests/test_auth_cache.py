@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, modify_settings, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notes.models import Note
+from yanote.auth import user_cache
+
+User = get_user_model()
+
+# Загрузка пользователя и сессии, а не JOIN с авторами заметок.
+AUTH_LOOKUPS = ('FROM "auth_user" WHERE', 'FROM "django_session" WHERE')
+
+
+def auth_queries(queries):
+    return [
+        query['sql'] for query in queries
+        if any(lookup in query['sql'] for lookup in AUTH_LOOKUPS)
+    ]
+
+
+class TestAuthCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Создаёт автора с заметкой."""
+        cls.author = User.objects.create(username='note_author')
+        Note.objects.create(
+            title='Sample Title',
+            text='Sample Text',
+            slug='sample-slug',
+            author=cls.author
+        )
+        cls.list_url = reverse('notes:list')
+
+    def setUp(self):
+        user_cache.clear()
+
+    def logged_in_client(self):
+        client = Client()
+        client.force_login(self.author)
+        return client
+
+    def page_queries(self, client):
+        """Запросы к базе повторного открытия списка заметок."""
+        client.get(self.list_url)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(self.list_url)
+        return queries.captured_queries
+
+    def test_cached_session_and_user_save_queries(self):
+        """
+        Проверяет, что повторный список заметок не читает ни сессию,
+        ни пользователя: на два запроса меньше, чем с сессиями в базе
+        и стандартным AuthenticationMiddleware.
+        """
+        cached = self.page_queries(self.logged_in_client())
+        self.assertEqual(auth_queries(cached), [])
+        with override_settings(
+            SESSION_ENGINE='django.contrib.sessions.backends.db'
+        ), modify_settings(MIDDLEWARE={
+            'remove': 'yanote.auth.CachedAuthenticationMiddleware',
+            'append': (
+                'django.contrib.auth.middleware.AuthenticationMiddleware'
+            ),
+        }):
+            stock = self.page_queries(self.logged_in_client())
+        self.assertEqual(len(auth_queries(stock)), 2)
+        self.assertEqual(len(stock) - len(cached), 2)
+
+    def test_logout_drops_cached_user(self):
+        """
+        Проверяет, что выход сбрасывает кэш пользователя: другая
+        сессия того же пользователя снова загружает его из базы.
+        """
+        first = self.logged_in_client()
+        second = self.logged_in_client()
+        self.assertEqual(auth_queries(self.page_queries(second)), [])
+        first.get(reverse('users:logout'))
+        with CaptureQueriesContext(connection) as queries:
+            response = second.get(self.list_url)
+        self.assertEqual(response.context['user'], self.author)
+        self.assertEqual(len(auth_queries(queries.captured_queries)), 1)
+
+    def test_password_change_ends_other_sessions(self):
+        """
+        Проверяет, что после смены пароля другая сессия не остаётся
+        авторизованной из-за кэша пользователя.
+        """
+        client = self.logged_in_client()
+        self.assertEqual(client.get(self.list_url).status_code, 200)
+        self.author.set_password('new-password')
+        self.author.save()
+        response = client.get(self.list_url)
+        self.assertRedirects(
+            response, f'{reverse("users:login")}?next={self.list_url}'
+        )
@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import Client, TestCase, TransactionTestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from notes.models import Note
+
+User = get_user_model()
+
+WRITERS = 8
+NOTES_PER_WRITER = 5
+
+
+class TestConnectionSettings(TestCase):
+    def test_connection_pragmas(self):
+        """Проверяет, что соединение получает настройки для нагрузки."""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA synchronous')
+            # 1 — NORMAL.
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+
+@override_settings(RATE_LIMITS={})
+class TestParallelWriters(TransactionTestCase):
+    def test_parallel_note_writers(self):
+        """
+        Проверяет, что параллельные авторы заметок с одинаковыми
+        заголовками не получают «database is locked» и ни одна
+        заметка не теряется.
+        """
+        users = [
+            User.objects.create(username=f'writer_{number}')
+            for number in range(WRITERS)
+        ]
+        url = reverse('notes:add')
+        form_data = {'title': 'Общий заголовок', 'text': 'Текст'}
+
+        def write(user):
+            client = Client()
+            client.force_login(user)
+            try:
+                return [
+                    client.post(url, form_data).status_code
+                    for _ in range(NOTES_PER_WRITER)
+                ]
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(WRITERS) as pool:
+            statuses = [
+                status
+                for result in pool.map(write, users)
+                for status in result
+            ]
+        self.assertEqual(
+            statuses, [HTTPStatus.FOUND] * WRITERS * NOTES_PER_WRITER
+        )
+        slugs = list(Note.objects.values_list('slug', flat=True))
+        self.assertEqual(len(slugs), WRITERS * NOTES_PER_WRITER)
+        self.assertEqual(len(set(slugs)), len(slugs))
@@ -6,11 +6,14 @@ from django.contrib.auth import get_user_model
 
 from notes.forms import NoteForm
 from notes.models import Note
+from yanote.budget import (
+    BudgetExceeded, ViewBudgetTestMixin, view_budget
+)
 
 User = get_user_model()
 
 
-class TestContent(TestCase):
+class TestContent(ViewBudgetTestMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         """Создание тестовых данных для проверки видимости заметок."""
@@ -45,8 +48,8 @@ class TestContent(TestCase):
                 url = reverse('notes:list')
                 response = client.get(url)
                 self.assertEqual(response.status_code, HTTPStatus.OK)
-                object_list = response.context['object_list']
-                self.assertIs(self.note in object_list, expected_in_list)
+                ids = [row.id for row in response.context['object_list']]
+                self.assertIs(self.note.id in ids, expected_in_list)
 
     def test_form_presence_on_create_and_edit_pages(self):
         """
@@ -64,3 +67,44 @@ class TestContent(TestCase):
                 self.assertIn('form', response.context)
                 form_obj = response.context['form']
                 self.assertIsInstance(form_obj, NoteForm)
+
+    def test_view_stats_recorded(self):
+        """
+        Проверяет, что для запроса к списку заметок записываются
+        имя URL, число SQL-запросов и время рендеринга.
+        """
+        self.author_client.get(reverse('notes:list'))
+        [stats] = self.view_stats
+        self.assertEqual(stats.url_name, 'notes:list')
+        self.assertGreater(stats.queries, 0)
+        self.assertGreater(stats.render_time, 0)
+
+    def test_view_over_budget_fails(self):
+        """Проверяет, что превышение бюджета запросов роняет тест."""
+        with self.assertRaisesRegex(BudgetExceeded, 'notes:list: queries'):
+            with view_budget({'notes:list': {'queries': 0}}):
+                self.author_client.get(reverse('notes:list'))
+
+    def test_search_only_own_notes_ranked(self):
+        """
+        Проверяет, что поиск находит только заметки пользователя,
+        ставит совпадения в заголовке выше совпадений в тексте
+        и не загружает текст заметок.
+        """
+        in_text = Note.objects.create(
+            title='Покупки', text='Купить молоко', author=self.note_author
+        )
+        in_title = Note.objects.create(
+            title='Молоко и хлеб', text='Не забыть', author=self.note_author
+        )
+        Note.objects.create(
+            title='Молоко', text='Чужая заметка', author=self.other_user
+        )
+        response = self.author_client.get(
+            reverse('notes:search'), {'q': 'молок'}
+        )
+        self.assertEqual(
+            list(response.context['object_list']), [in_title, in_text]
+        )
+        for note in response.context['object_list']:
+            self.assertEqual(note.get_deferred_fields(), {'text', 'author_id'})
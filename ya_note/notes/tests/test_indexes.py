@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from notes.models import Note
+from yanote.budget import ViewBudgetTestMixin
+
+User = get_user_model()
+
+
+class TestIndexes(ViewBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Создаёт автора с несколькими заметками и чужую заметку."""
+        cls.note_author = User.objects.create(username='note_author')
+        cls.other_user = User.objects.create(username='other_user')
+        cls.author_client = Client()
+        cls.author_client.force_login(cls.note_author)
+        Note.objects.bulk_create(
+            Note(
+                title=f'Note {i}',
+                text='Text',
+                slug=f'note-{i}',
+                author=cls.note_author
+            )
+            for i in range(5)
+        )
+        Note.objects.create(
+            title='Other', text='Text', slug='other', author=cls.other_user
+        )
+
+    def get_query_plans(self, url, table):
+        """Возвращает планы SQLite для запросов представления к таблице."""
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            if f'FROM "{table}"' in sql and sql.startswith('SELECT'):
+                queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            self.author_client.get(url)
+        self.assertTrue(queries)
+        plans = []
+        with connection.cursor() as cursor:
+            for sql, params in queries:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plans.append(' | '.join(row[-1] for row in cursor.fetchall()))
+        return plans
+
+    def test_notes_list_uses_author_index(self):
+        """
+        Проверяет, что список заметок выбирается поиском
+        по индексу `(author_id, id)`, а не просмотром таблицы.
+        """
+        for plan in self.get_query_plans(reverse('notes:list'), 'notes_note'):
+            with self.subTest(plan=plan):
+                self.assertTrue(plan.startswith('SEARCH notes_note'))
+                self.assertIn('note_author_id_idx', plan)
+                self.assertNotIn('TEMP B-TREE', plan)
@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notes.models import Note
+
+User = get_user_model()
+
+
+class TestNoteList(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Создаёт автора с заметкой и чужую заметку."""
+        cls.author = User.objects.create(username='note_author')
+        cls.other_user = User.objects.create(username='other_user')
+        cls.note = Note.objects.create(
+            title='Sample Title',
+            text='Sample Text',
+            slug='sample-slug',
+            author=cls.author
+        )
+        Note.objects.create(
+            title='Other Title',
+            text='Other Text',
+            slug='other-slug',
+            author=cls.other_user
+        )
+        cls.list_url = reverse('notes:list')
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.author)
+
+    def listed(self, **params):
+        """Заметки списка и запросы к таблице заметок при его показе."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, params)
+        rows = [
+            (row.id, row.slug, row.title)
+            for row in response.context['object_list']
+        ]
+        note_queries = [
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "notes_note"' in query['sql']
+        ]
+        return rows, note_queries
+
+    def expected(self):
+        return list(
+            Note.objects.filter(author=self.author).order_by('id').values_list(
+                'id', 'slug', 'title'
+            )
+        )
+
+    def test_list_reads_projection(self):
+        """
+        Проверяет, что список выбирает только заметки автора
+        без столбца `text`: подсчёт и одна страница.
+        """
+        rows, note_queries = self.listed()
+        self.assertEqual(rows, self.expected())
+        self.assertEqual(len(note_queries), 2)
+        for sql in note_queries:
+            with self.subTest(sql=sql):
+                self.assertNotIn('"text"', sql)
+
+    def test_writes_shown_at_once(self):
+        """
+        Проверяет, что создание, правка и удаление заметки
+        сразу видны в списке.
+        """
+        self.client.post(
+            reverse('notes:add'), {'title': 'New Note', 'text': 'Text'}
+        )
+        self.client.post(
+            reverse('notes:edit', args=(self.note.slug,)),
+            {'title': 'Edited Title', 'text': 'Text', 'slug': 'edited'},
+        )
+        rows, _ = self.listed()
+        self.assertEqual(rows, self.expected())
+        self.assertEqual(
+            [title for _, _, title in rows], ['Edited Title', 'New Note']
+        )
+        self.client.post(reverse('notes:delete', args=('edited',)))
+        rows, _ = self.listed()
+        self.assertEqual(rows, self.expected())
+        self.assertEqual(len(rows), 1)
+
+    @override_settings(NOTES_LIST_PAGE_SIZE=2)
+    def test_list_is_paginated(self):
+        """Проверяет, что список выводится страницами."""
+        for number in range(3):
+            Note.objects.create(
+                title=f'Note {number}', text='Text', author=self.author
+            )
+        response = self.client.get(self.list_url)
+        self.assertEqual(len(response.context['object_list']), 2)
+        self.assertContains(response, '?page=2')
+        rows, _ = self.listed(page=2)
+        self.assertEqual(
+            [title for _, _, title in rows], ['Note 1', 'Note 2']
+        )
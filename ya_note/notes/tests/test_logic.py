@@ -1,17 +1,30 @@
+import json
+import tempfile
 from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
 from pytils.translit import slugify
 
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
-from notes.forms import WARNING
+from notes.forms import SLUG_RETRY, WARNING
+from notes import slugs
+from notes.bulk import import_notes
 from notes.models import Note
+from yanote.budget import ViewBudgetTestMixin
+from yanote.ratelimit import get_counters
 
 User = get_user_model()
 
 
-class TestNoteCreation(TestCase):
+class TestNoteCreation(ViewBudgetTestMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         """Подготовка данных для тестирования создания заметок."""
@@ -77,8 +90,88 @@ class TestNoteCreation(TestCase):
         note = Note.objects.get(title=self.form_data['title'])
         self.assertEqual(note.slug, slugify(self.form_data['title']))
 
+    def test_auto_slug_collision_gets_suffix(self):
+        """
+        Проверяет, что при совпадении автоматического slug
+        к нему добавляется свободный числовой суффикс.
+        """
+        base = slugify(self.form_data['title'])
+        for slug in (base, f'{base}-2'):
+            Note.objects.create(
+                author=self.user, title='Taken', text='Text', slug=slug
+            )
+        del self.form_data['slug']
+        response = self.user_client.post(self.url, data=self.form_data)
+        self.assertRedirects(response, reverse('notes:success'))
+        note = Note.objects.get(title=self.form_data['title'])
+        self.assertEqual(note.slug, f'{base}-3')
+
+    def test_auto_slug_retry_on_integrity_error(self):
+        """
+        Проверяет, что если slug заняли между подбором и вставкой,
+        сохранение повторяется со следующим свободным вариантом.
+        """
+        base = slugify(self.form_data['title'])
+        Note.objects.create(
+            author=self.user, title='Taken', text='Text', slug=base
+        )
+        stale_then_fresh = [set(), {base}]
+        with mock.patch(
+            'notes.models.taken_slugs',
+            side_effect=lambda *args: stale_then_fresh.pop(0)
+        ) as taken:
+            note = Note.objects.create(
+                author=self.user, title=self.form_data['title'], text='Text'
+            )
+        self.assertEqual(taken.call_count, 2)
+        self.assertEqual(note.slug, f'{base}-2')
+
+    def test_auto_slug_attempts_exhausted(self):
+        """
+        Проверяет, что если все подобранные slug заняты параллельными
+        записями, форма просит повторить отправку, а не ругается
+        на незаполненное поле slug.
+        """
+        base = slugify(self.form_data['title'])
+        Note.objects.create(
+            author=self.user, title='Taken', text='Text', slug=base
+        )
+        initial_count = Note.objects.count()
+        del self.form_data['slug']
+        with mock.patch('notes.models.SLUG_ATTEMPTS', 1), mock.patch(
+            'notes.models.taken_slugs', return_value=set()
+        ):
+            response = self.user_client.post(self.url, data=self.form_data)
+        self.assertFormError(response, 'form', None, SLUG_RETRY)
+        self.assertFormError(response, 'form', 'slug', [])
+        self.assertEqual(Note.objects.count(), initial_count)
+
+    def test_taken_slugs_skip_longer_words(self):
+        """
+        Проверяет, что для короткого slug читаются только его варианты
+        `base-N`, а не все slug, которые с него начинаются.
+        """
+        for slug in ('note', 'note-2', 'notebook', 'notes-1', 'note-book'):
+            Note.objects.create(
+                author=self.user, title='Taken', text='Text', slug=slug
+            )
+        self.assertEqual(
+            slugs.taken_slugs(Note.objects.all(), 'note', max_length=100),
+            {'note', 'note-2', 'note-book'},
+        )
+        self.assertEqual(
+            slugs.taken_slugs(Note.objects.all(), 'notebook', max_length=12),
+            {'note', 'note-2', 'notebook', 'notes-1', 'note-book'},
+        )
+
+    def test_pick_free_slug_respects_max_length(self):
+        """Проверяет, что суффикс не выводит slug за допустимую длину."""
+        base = 'a' * 10
+        slug = slugs.pick_free_slug(base, {base}, max_length=10)
+        self.assertEqual(slug, 'a' * 8 + '-2')
 
-class TestNoteEditDelete(TestCase):
+
+class TestNoteEditDelete(ViewBudgetTestMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         """
@@ -147,3 +240,217 @@ class TestNoteEditDelete(TestCase):
         self.assertEqual(self.note.slug, original_slug)
         self.assertEqual(self.note.title, original_title)
         self.assertEqual(self.note.text, original_text)
+
+
+@override_settings(RATE_LIMITS={'notes': {'requests': 2, 'period': 60}})
+class TestNoteRateLimit(ViewBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Подготовка данных для проверки лимита частоты записей."""
+        cls.user = User.objects.create(username='test_user')
+        cls.user_client = Client()
+        cls.user_client.force_login(cls.user)
+        cls.url = reverse('notes:add')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_writes_over_limit_rejected(self):
+        """
+        Проверяет, что сверх лимита заметка не создаётся, ответ
+        содержит код 429 и Retry-After, а отказ виден в счётчиках.
+        """
+        responses = [
+            self.user_client.post(
+                self.url, data={'title': f'Note {i}', 'text': 'Text'}
+            )
+            for i in range(3)
+        ]
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [HTTPStatus.FOUND, HTTPStatus.FOUND, HTTPStatus.TOO_MANY_REQUESTS],
+        )
+        self.assertEqual(responses[-1]['Retry-After'], '30')
+        self.assertEqual(Note.objects.count(), 2)
+        self.assertEqual(
+            get_counters('notes', self.user.pk),
+            {'allowed': 2, 'limited': 1},
+        )
+
+    def test_imports_over_limit_rejected(self):
+        """Проверяет, что импорт расходует токены той же области."""
+        statuses = [
+            self.user_client.post(
+                reverse('notes:import'),
+                data=json.dumps({'title': f'Note {i}', 'text': 'Text'}),
+                content_type='application/x-ndjson',
+            ).status_code
+            for i in range(3)
+        ]
+        self.assertEqual(
+            statuses,
+            [HTTPStatus.CREATED, HTTPStatus.CREATED,
+             HTTPStatus.TOO_MANY_REQUESTS],
+        )
+        self.assertEqual(Note.objects.count(), 2)
+
+    def test_anonymous_user_not_counted(self):
+        """Проверяет, что анонимные запросы не расходуют токены."""
+        for _ in range(3):
+            response = self.client.post(self.url, data={'title': 'Note'})
+            self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        self.assertEqual(
+            get_counters('notes', None), {'allowed': 0, 'limited': 0}
+        )
+
+
+class TestNoteImportExport(ViewBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Подготовка данных для проверки массового импорта и экспорта."""
+        cls.user = User.objects.create(username='test_user')
+        cls.other_user = User.objects.create(username='other_user')
+        cls.user_client = Client()
+        cls.user_client.force_login(cls.user)
+        cls.import_url = reverse('notes:import')
+        cls.export_url = reverse('notes:export')
+        Note.objects.create(
+            author=cls.other_user, title='Taken', text='Text', slug='taken'
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def post_rows(self, rows, content_type='application/x-ndjson'):
+        if content_type == 'text/csv':
+            body = 'title,text,slug\n' + ''.join(
+                f'{row["title"]},{row["text"]},{row.get("slug", "")}\n'
+                for row in rows
+            )
+        else:
+            body = ''.join(json.dumps(row) + '\n' for row in rows)
+        return self.user_client.post(
+            self.import_url, data=body, content_type=content_type
+        )
+
+    def test_import_ndjson_allocates_slugs(self):
+        """
+        Проверяет импорт NDJSON: заметки создаются у автора запроса,
+        а совпадающие slug получают числовые суффиксы.
+        """
+        rows = [
+            {'title': 'Taken', 'text': 'First'},
+            {'title': 'Taken', 'text': 'Second'},
+            {'title': 'Own', 'text': 'Third', 'slug': 'own-slug'},
+        ]
+        response = self.post_rows(rows)
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertEqual(response.json(), {'created': len(rows)})
+        self.assertEqual(
+            list(
+                Note.objects.filter(author=self.user)
+                .order_by('pk').values_list('slug', flat=True)
+            ),
+            ['taken-2', 'taken-3', 'own-slug'],
+        )
+
+    def test_import_csv(self):
+        """Проверяет импорт CSV."""
+        response = self.post_rows(
+            [{'title': 'Csv note', 'text': 'Text'}], content_type='text/csv'
+        )
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertTrue(
+            Note.objects.filter(author=self.user, slug='csv-note').exists()
+        )
+
+    def test_import_rejected_as_a_whole(self):
+        """
+        Проверяет, что при ошибке в любой строке импорт отменяется
+        целиком, а ошибки возвращаются с номерами записей.
+        """
+        initial_count = Note.objects.count()
+        response = self.post_rows([
+            {'title': 'Valid', 'text': 'Text'},
+            {'title': 'No text', 'text': ''},
+            {'title': 'Busy', 'text': 'Text', 'slug': 'taken'},
+        ])
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        errors = response.json()['errors']
+        self.assertEqual([error['row'] for error in errors], [2, 3])
+        self.assertEqual(errors[1]['errors']['slug'], [f'taken{WARNING}'])
+        self.assertEqual(Note.objects.count(), initial_count)
+
+    def test_rows_read_before_transaction(self):
+        """
+        Проверяет, что все строки читаются до открытия транзакции:
+        пишущая транзакция SQLite не ждёт медленного клиента.
+        """
+        depth = len(connection.savepoint_ids)
+        depths = []
+
+        def rows():
+            for i in range(3):
+                depths.append(len(connection.savepoint_ids))
+                yield {'title': f'Slow {i}', 'text': 'Text'}
+
+        self.assertEqual(import_notes(self.user, rows(), batch_size=2), 3)
+        self.assertEqual(depths, [depth] * 3)
+
+    def test_export_streams_only_own_notes(self):
+        """Проверяет, что экспорт отдаёт только заметки пользователя."""
+        self.post_rows(
+            [{'title': f'Note {i}', 'text': 'Text'} for i in range(3)]
+        )
+        response = self.user_client.get(self.export_url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(
+            [row['slug'] for row in rows], ['note-0', 'note-1', 'note-2']
+        )
+
+    def test_import_command(self):
+        """Проверяет импорт заметок из файла командой import_notes."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'notes.ndjson'
+            path.write_text(
+                json.dumps({'title': 'From file', 'text': 'Text'}) + '\n',
+                encoding='utf-8',
+            )
+            call_command(
+                'import_notes', str(path), author=self.user.username,
+                stdout=StringIO()
+            )
+        self.assertTrue(
+            Note.objects.filter(author=self.user, slug='from-file').exists()
+        )
+
+    def test_generate_notes_command(self):
+        """
+        Проверяет, что повторный запуск generate_notes не путает slug,
+        а имена пользователей продолжают нумерацию `load_N`.
+        """
+        User.objects.create(username='load_7')
+        for _ in range(2):
+            call_command(
+                'generate_notes', users=3, notes=20, batch_size=7,
+                stdout=StringIO()
+            )
+        generated = Note.objects.filter(author__username__startswith='load_')
+        self.assertEqual(
+            set(User.objects.filter(
+                username__startswith='load_'
+            ).values_list('username', flat=True)),
+            {f'load_{number}' for number in range(7, 14)},
+        )
+        self.assertGreater(generated.count(), 20)
+        self.assertTrue(
+            all(slug.startswith('load-') for slug in generated.values_list(
+                'slug', flat=True
+            ))
+        )
@@ -0,0 +1,142 @@
+import tempfile
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import (
+    AsyncClient, Client, TestCase, TransactionTestCase, override_settings
+)
+from django.urls import reverse
+
+from notes.models import Note
+from yanote import settings_asgi
+
+User = get_user_model()
+
+
+class ReplicaTestMixin:
+    """
+    Делает реплику отдельным файлом SQLite — снимком основной базы.
+
+    `replicate()` обновляет снимок: до её вызова реплика отстаёт
+    от основной базы.
+    """
+    databases = {DEFAULT_DB_ALIAS, settings.REPLICA_DATABASE}
+
+    def setUp(self):
+        super().setUp()
+        self.primary = connections[DEFAULT_DB_ALIAS]
+        self.copy = connections[settings.REPLICA_DATABASE]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        mirror_name = self.copy.settings_dict['NAME']
+        self.copy.close()
+        self.copy.settings_dict['NAME'] = str(
+            Path(directory.name) / 'replica.sqlite3'
+        )
+        self.addCleanup(self.restore_mirror, mirror_name)
+
+    def restore_mirror(self, mirror_name):
+        self.copy.close()
+        self.copy.settings_dict['NAME'] = mirror_name
+
+    def replicate(self):
+        self.primary.ensure_connection()
+        self.copy.ensure_connection()
+        self.primary.connection.backup(self.copy.connection)
+
+
+class TestReplicaReads(ReplicaTestMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.author = User.objects.create(username='note_author')
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.note = Note.objects.create(
+            title='Sample Title',
+            text='Sample Text',
+            slug='sample-slug',
+            author=self.author,
+        )
+        self.list_url = reverse('notes:list')
+        self.detail_url = reverse('notes:detail', args=(self.note.slug,))
+        self.replicate()
+        Note.objects.filter(pk=self.note.pk).update(text='Fresh Text')
+
+    def test_reads_go_to_replica(self):
+        """
+        Проверяет, что заметка читается с реплики: изменение,
+        которое до неё не дошло, не видно.
+        """
+        response = self.author_client.get(self.detail_url)
+        self.assertNotContains(response, 'Fresh Text')
+        self.replicate()
+        response = self.author_client.get(self.detail_url)
+        self.assertContains(response, 'Fresh Text')
+
+    def test_async_reads_go_to_replica(self):
+        """Проверяет, что и в ASGI-профиле заметка читается с реплики."""
+        client = AsyncClient()
+        client.force_login(self.author)
+
+        @async_to_sync
+        async def get(url):
+            return await client.get(url)
+
+        with override_settings(
+            ROOT_URLCONF=settings_asgi.ROOT_URLCONF,
+            MIDDLEWARE=settings_asgi.MIDDLEWARE,
+        ):
+            response = get(self.detail_url)
+            self.assertNotContains(response, 'Fresh Text')
+            self.replicate()
+            response = get(self.detail_url)
+            self.assertContains(response, 'Fresh Text')
+
+    def test_writer_reads_from_primary(self):
+        """
+        Проверяет, что после записи автор сразу видит изменение,
+        а после закрепления снова читает с реплики.
+        """
+        self.author_client.post(
+            reverse('notes:edit', args=(self.note.slug,)),
+            {'title': 'Sample Title', 'text': 'Edited Text',
+             'slug': self.note.slug},
+        )
+        response = self.author_client.get(self.detail_url)
+        self.assertContains(response, 'Edited Text')
+        cache.clear()
+        response = self.author_client.get(self.detail_url)
+        self.assertNotContains(response, 'Edited Text')
+
+    def test_note_list_reads_go_to_replica(self):
+        """
+        Проверяет, что список заметок читается с реплики,
+        а автор, который только что писал, видит свою запись.
+        """
+        Note.objects.create(
+            title='New Note', text='Text', slug='new', author=self.author
+        )
+        response = self.author_client.get(self.list_url)
+        self.assertNotContains(response, 'New Note')
+        self.author_client.post(
+            reverse('notes:add'), {'title': 'Own Note', 'text': 'Text'}
+        )
+        response = self.author_client.get(self.list_url)
+        self.assertContains(response, 'Own Note')
+
+
+class TestMirrorReplica(TestCase):
+    def test_mirror_replica_is_not_used(self):
+        """
+        Проверяет, что реплика-зеркало той же базы не используется:
+        тесту без доступа к ней страницы всё равно доступны.
+        """
+        user = User.objects.create(username='reader')
+        self.client.force_login(user)
+        response = self.client.get(reverse('notes:list'))
+        self.assertEqual(response.status_code, 200)
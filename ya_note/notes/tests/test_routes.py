@@ -5,11 +5,12 @@ from django.test import Client, TestCase
 from django.urls import reverse
 
 from notes.models import Note
+from yanote.budget import ViewBudgetTestMixin
 
 User = get_user_model()
 
 
-class TestRoutes(TestCase):
+class TestRoutes(ViewBudgetTestMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         """Создает тестовых пользователей и заметку для проверки маршрутов."""
@@ -1,9 +1,18 @@
+import csv
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import IntegrityError, transaction
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.urls import reverse_lazy
 from django.views import generic
 
-from .forms import NoteForm
+from yanote.ratelimit import RateLimitMixin
+
+from .bulk import FORMATS, ImportFailed, export_rows, import_notes, read_rows
+from .forms import SLUG_RETRY, WARNING, NoteForm
 from .models import Note
+from .search import search_notes
 
 
 class Home(generic.TemplateView):
@@ -25,23 +34,43 @@ class NoteBase(LoginRequiredMixin):
         """Пользователь может работать только со своими заметками."""
         return self.model.objects.filter(author=self.request.user)
 
-
-class NoteCreate(NoteBase, generic.CreateView):
+    def form_valid(self, form):
+        """
+        Сохраняет заметку, полагаясь на уникальный индекс slug.
+
+        Проверка в форме не защищает от параллельной записи с тем же
+        slug, поэтому ошибку индекса тоже показываем как ошибку поля.
+        Если slug подбирался по заголовку и все попытки заняли
+        параллельные записи, поле пустое: просим повторить отправку.
+        """
+        try:
+            with transaction.atomic():
+                return super().form_valid(form)
+        except IntegrityError:
+            slug = form.instance.slug
+            if slug:
+                form.add_error('slug', slug + WARNING)
+            else:
+                form.add_error(None, SLUG_RETRY)
+            return self.form_invalid(form)
+
+
+class NoteCreate(NoteBase, RateLimitMixin, generic.CreateView):
     """Добавление заметки."""
     template_name = 'notes/form.html'
     form_class = NoteForm
+    ratelimit_scope = 'notes'
 
     def form_valid(self, form):
-        new_note = form.save(commit=False)
-        new_note.author = self.request.user
-        new_note.save()
+        form.instance.author = self.request.user
         return super().form_valid(form)
 
 
-class NoteUpdate(NoteBase, generic.UpdateView):
+class NoteUpdate(NoteBase, RateLimitMixin, generic.UpdateView):
     """Редактирование заметки."""
     template_name = 'notes/form.html'
     form_class = NoteForm
+    ratelimit_scope = 'notes'
 
 
 class NoteDelete(NoteBase, generic.DeleteView):
@@ -50,10 +79,92 @@ class NoteDelete(NoteBase, generic.DeleteView):
 
 
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
+    """
+    Список всех заметок пользователя.
+
+    Вместо моделей — проекция `(id, slug, title)` без столбца `text`;
+    страница выбирается по индексу `(author_id, id)`. Страница выводит
+    не больше `NOTES_LIST_PAGE_SIZE` строк: дольше всего рендеринг
+    ссылок.
+    """
     template_name = 'notes/list.html'
+    replica_reads = True
+
+    def get_queryset(self):
+        return super().get_queryset().order_by('id').values_list(
+            'id', 'slug', 'title', named=True
+        )
+
+    def get_paginate_by(self, queryset):
+        return settings.NOTES_LIST_PAGE_SIZE
+
+
+class NoteSearch(NoteBase, generic.ListView):
+    """Поиск по заметкам пользователя."""
+    template_name = 'notes/search.html'
+
+    def get_queryset(self):
+        return search_notes(
+            self.request.user,
+            self.request.GET.get('q', ''),
+            settings.SEARCH_RESULTS_LIMIT,
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        return context
 
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+    replica_reads = True
+
+
+class NoteImport(LoginRequiredMixin, RateLimitMixin, generic.View):
+    """
+    Массовый импорт заметок пользователя.
+
+    Тело запроса читается потоком: NDJSON по умолчанию
+    или CSV при `Content-Type: text/csv`. Транзакция открывается
+    только после того, как тело прочитано целиком.
+    """
+    ratelimit_scope = 'notes'
+
+    def post(self, request, *args, **kwargs):
+        fmt = 'csv' if request.content_type == 'text/csv' else 'ndjson'
+        lines = (line.decode('utf-8') for line in request)
+        try:
+            created = import_notes(
+                request.user,
+                read_rows(lines, fmt),
+                batch_size=settings.NOTES_IMPORT_BATCH_SIZE,
+            )
+        except ImportFailed as error:
+            return JsonResponse({'errors': error.errors}, status=400)
+        except (ValueError, csv.Error) as error:
+            return JsonResponse({'errors': [str(error)]}, status=400)
+        return JsonResponse({'created': created}, status=201)
+
+
+class NoteExport(NoteBase, generic.View):
+    """Потоковая выгрузка всех заметок пользователя."""
+    content_types = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.GET.get('format', 'ndjson')
+        if fmt not in FORMATS:
+            raise Http404('Неизвестный формат выгрузки.')
+        response = StreamingHttpResponse(
+            export_rows(
+                self.get_queryset(),
+                fmt,
+                chunk_size=settings.NOTES_EXPORT_CHUNK_SIZE,
+            ),
+            content_type=self.content_types[fmt],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="notes.{fmt}"'
+        )
+        return response
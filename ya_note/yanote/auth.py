@@ -0,0 +1,108 @@
+"""
+Пользователь запроса без обращения к базе.
+
+`CachedAuthenticationMiddleware` заменяет `AuthenticationMiddleware`:
+проверенный пользователь хранится в памяти процесса под ключом
+(id, бэкенд, хэш авторизации из сессии) не дольше `USER_CACHE_TIMEOUT`
+секунд. Пока запись жива, страница не делает SELECT пользователя,
+а вместе с сессиями `cached_db` — ни одного запроса до кода
+представления.
+
+Хэш авторизации меняется вместе с паролем, поэтому сессии со старым
+хэшем в кэш не попадают. Запись пользователя сбрасывается при выходе
+и при любом сохранении или удалении пользователя в этом процессе;
+в остальных процессах она доживает до конца TTL.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject
+
+
+class UserCache:
+    """Потокобезопасный словарь с TTL и ограничением размера."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            return user
+
+    def set(self, key, user):
+        with self._lock:
+            self._entries[key] = (
+                time.monotonic() + settings.USER_CACHE_TIMEOUT, user
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.USER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Сбрасывает все записи пользователя."""
+        user_id = str(user_id)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+def get_user(request):
+    """Как `django.contrib.auth.get_user`, но через `user_cache`."""
+    try:
+        user_id = str(auth._get_user_session_key(request))
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    key = (user_id, backend_path, request.session.get(HASH_SESSION_KEY))
+    user = user_cache.get(key)
+    if user is None:
+        # Полная проверка: загрузка пользователя и сверка хэша сессии.
+        user = auth.get_user(request)
+        if not user.is_authenticated:
+            return user
+        user_cache.set(key, user)
+    # Запросы не делят между собой один изменяемый объект.
+    return copy.copy(user)
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+
+    def process_request(self, request):
+        request.user = SimpleLazyObject(lambda: get_user(request))
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        user_cache.invalidate(user.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def forget_changed_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
@@ -0,0 +1,136 @@
+"""
+Ограничение частоты записей от одного пользователя.
+
+Ведро токенов реализовано по алгоритму GCRA: для пары «область —
+пользователь» в кэше хранится теоретическое время следующего запроса
+(TAT) в миллисекундах. Каждый запрос атомарно сдвигает его через
+`cache.incr` на интервал между токенами; если TAT ушёл дальше, чем
+позволяет ёмкость ведра, запрос отклоняется, а сдвиг возвращается.
+Ключ живёт ровно до момента, когда ведро снова наполнится, поэтому
+отсутствие ключа означает полное ведро.
+
+Лимиты задаются в настройке `RATE_LIMITS`:
+
+    RATE_LIMITS = {'notes': {'requests': 30, 'period': 60}}
+
+`requests` — сколько записей можно сделать подряд и сколько токенов
+восстанавливается за `period` секунд. Для монитора на каждого
+пользователя ведутся счётчики пропущенных и отклонённых запросов,
+см. `get_counters`. Чтобы лимит был общим для всех процессов, кэш
+должен быть общим (не `LocMemCache`).
+"""
+import logging
+import math
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ('allowed', 'limited')
+COUNTERS_TIMEOUT = 60 * 60 * 24
+
+Decision = namedtuple('Decision', ('allowed', 'retry_after'))
+
+
+def get_limit(scope):
+    """Лимит области из настроек или `None`, если он не задан."""
+    return getattr(settings, 'RATE_LIMITS', {}).get(scope)
+
+
+def bucket_key(scope, user_id):
+    return f'ratelimit:{scope}:{user_id}'
+
+
+def counter_key(scope, user_id, counter):
+    return f'ratelimit:{scope}:{user_id}:{counter}'
+
+
+def _count(scope, user_id, counter):
+    key = counter_key(scope, user_id, counter)
+    cache.add(key, 0, COUNTERS_TIMEOUT)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, COUNTERS_TIMEOUT)
+
+
+def get_counters(scope, user_id):
+    """Пропущенные и отклонённые запросы пользователя за последние сутки."""
+    values = cache.get_many(
+        [counter_key(scope, user_id, counter) for counter in COUNTERS]
+    )
+    return {
+        counter: values.get(counter_key(scope, user_id, counter), 0)
+        for counter in COUNTERS
+    }
+
+
+def hit(scope, user_id, requests, period):
+    """Расходует токен пользователя; возвращает решение `Decision`."""
+    interval = period * 1000 // requests
+    tolerance = interval * requests
+    key = bucket_key(scope, user_id)
+    now = int(time.time() * 1000)
+    cache.add(key, now, period)
+    try:
+        tat = cache.incr(key, interval)
+    except ValueError:
+        # Ключ вытеснили между add и incr: ведро снова полное.
+        tat = None
+    if tat is None or tat - interval < now:
+        # Ведро было полным: отсчёт начинается с текущего момента.
+        tat = now + interval
+        cache.set(key, tat, period)
+    if tat - now > tolerance:
+        cache.decr(key, interval)
+        _count(scope, user_id, 'limited')
+        return Decision(False, math.ceil((tat - now - tolerance) / 1000))
+    cache.touch(key, math.ceil((tat - now) / 1000) + 1)
+    _count(scope, user_id, 'allowed')
+    return Decision(True, 0)
+
+
+class RateLimitMixin:
+    """
+    Примесь к CBV: ограничивает частоту записей пользователя.
+
+    Ставится после `LoginRequiredMixin`, чтобы анонимные запросы
+    уходили на страницу входа, не расходуя токенов. Область лимита
+    задаётся в `ratelimit_scope`, проверяемые методы — в
+    `ratelimit_methods`.
+    """
+    ratelimit_scope = None
+    ratelimit_methods = ('POST',)
+
+    def dispatch(self, request, *args, **kwargs):
+        limit = get_limit(self.ratelimit_scope)
+        if (
+            limit
+            and request.method in self.ratelimit_methods
+            and request.user.is_authenticated
+        ):
+            decision = hit(
+                self.ratelimit_scope,
+                request.user.pk,
+                limit['requests'],
+                limit['period'],
+            )
+            if not decision.allowed:
+                logger.warning(
+                    'Rate limit %s exceeded by user %s',
+                    self.ratelimit_scope,
+                    request.user.pk,
+                )
+                return self.rate_limited(decision)
+        return super().dispatch(request, *args, **kwargs)
+
+    def rate_limited(self, decision):
+        response = HttpResponse(
+            'Слишком много запросов, попробуйте позже.', status=429
+        )
+        response['Retry-After'] = str(decision.retry_after)
+        return response
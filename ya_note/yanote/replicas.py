@@ -0,0 +1,165 @@
+"""
+Чтение страниц с реплики базы.
+
+Представления с атрибутом `replica_reads = True` (список заметок,
+заметка; у асинхронных представлений — атрибут функции) на GET
+и HEAD читают с базы `REPLICA_DATABASE`, всё остальное идёт
+в `default`.
+
+Реплика отстаёт от основной базы, поэтому пользователь, который
+только что что-то записал, `REPLICA_PIN_SECONDS` секунд читает
+с основной базы и сразу видит свою запись. Отметка хранится в кэше;
+чтобы она действовала во всех процессах, кэш должен быть общим.
+
+Если реплика указывает на ту же базу, что и `default` (при разработке
+или как тестовое зеркало `TEST['MIRROR']`), маршрутизация отключается.
+
+    DATABASE_ROUTERS = ['yanote.replicas.ReplicaRouter']
+    MIDDLEWARE = [..., 'yanote.replicas.ReplicaMiddleware', ...]
+"""
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Направляет чтения пользователя в основную базу на время."""
+    cache.set(pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user):
+    return user.is_authenticated and cache.get(pin_key(user.pk)) is not None
+
+
+def reads_from_replica():
+    """Читает ли текущий запрос с реплики."""
+    return _read_alias.get() is not None
+
+
+@contextmanager
+def read_from_primary():
+    """Направляет чтения блока в основную базу."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def replica_alias():
+    """Псевдоним реплики или `None`, если отдельной реплики нет."""
+    alias = getattr(settings, 'REPLICA_DATABASE', None)
+    if alias is None or alias not in connections.databases:
+        return None
+    if (
+        connections[alias].settings_dict['NAME']
+        == connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+    ):
+        return None
+    return alias
+
+
+class ReplicaRouter:
+    """Читает с базы, выбранной `ReplicaMiddleware`, пишет в `default`."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Иначе объект, прочитанный с реплики, сохранялся бы в неё же.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика хранит те же строки, что и основная база.
+        return True
+
+
+class ReplicaMiddleware(MiddlewareMixin):
+    """
+    Выбирает базу для чтения на время запроса и закрепляет
+    за основной базой пользователей, которые только что писали.
+
+    Работает и синхронно, и в цикле событий ASGI: в поток уходят
+    только проверка закрепления у страниц с `replica_reads`
+    и отметка после записи, а не каждый запрос.
+
+    Должен стоять после `AuthenticationMiddleware`.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if asyncio.iscoroutinefunction(self):
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        if self.is_write(request, response):
+            self.pin(request)
+        return response
+
+    async def __acall__(self, request):
+        token = _read_alias.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        if self.is_write(request, response):
+            await sync_to_async(self.pin, thread_sensitive=True)(request)
+        return response
+
+    @staticmethod
+    def is_write(request, response):
+        return (
+            request.method not in SAFE_METHODS and response.status_code < 400
+        )
+
+    @staticmethod
+    def pin(request):
+        if request.user.is_authenticated:
+            pin_to_primary(request.user.pk)
+
+    @staticmethod
+    def reads_replica(request, view_func):
+        """Читает ли представление с реплики (класс или функция)."""
+        view = getattr(view_func, 'view_class', view_func)
+        return (
+            request.method in SAFE_METHODS
+            and getattr(view, 'replica_reads', False)
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            self.reads_replica(request, view_func)
+            and not is_pinned(request.user)
+        ):
+            _read_alias.set(replica_alias())
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if not self.reads_replica(request, view_func):
+            return
+        # Пользователь и сессия загружаются из базы, а в цикле
+        # событий запросы к ней запрещены.
+        if not await sync_to_async(is_pinned, thread_sensitive=True)(
+            request.user
+        ):
+            _read_alias.set(replica_alias())
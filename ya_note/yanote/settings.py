@@ -22,11 +22,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'yanote.budget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'yanote.auth.CachedAuthenticationMiddleware',
+    'yanote.replicas.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -54,11 +56,28 @@ WSGI_APPLICATION = 'yanote.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'yanote.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {'timeout': 20},
+        # Тестовая база в файле: в памяти SQLite не даёт проверить
+        # параллельную запись из нескольких потоков.
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+    },
+    # При разработке реплика — тот же файл, и чтения с неё не
+    # переключаются (см. yanote/replicas.py). В работе здесь копия
+    # основной базы.
+    'replica': {
+        'ENGINE': 'yanote.sqlite',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {'timeout': 20},
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+DATABASE_ROUTERS = ['yanote.replicas.ReplicaRouter']
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -87,3 +106,39 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_IMPORT_BATCH_SIZE = 1000
+
+NOTES_EXPORT_CHUNK_SIZE = 1000
+
+NOTES_LIST_PAGE_SIZE = 100
+
+SEARCH_RESULTS_LIMIT = 50
+
+# Сессия читается из кэша, в базу — только при промахе. Профиль без
+# базы вовсе: 'django.contrib.sessions.backends.signed_cookies'.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+USER_CACHE_TIMEOUT = 60
+
+USER_CACHE_SIZE = 10000
+
+REPLICA_DATABASE = 'replica'
+
+REPLICA_PIN_SECONDS = 5
+
+# Ведро токенов на запись, см. yanote/ratelimit.py.
+RATE_LIMITS = {
+    'notes': {'requests': 30, 'period': 60},
+}
+
+# Бюджеты представлений с учётом чтения сессии и пользователя,
+# см. yanote/budget.py.
+VIEW_BUDGETS = {
+    'notes:list': {'queries': 3},
+    'notes:detail': {'queries': 3},
+    'notes:add': {'queries': 5},
+    'notes:edit': {'queries': 6},
+    'notes:delete': {'queries': 4},
+    'notes:success': {'queries': 2},
+}
@@ -0,0 +1,25 @@
+"""
+Профиль развёртывания под ASGI.
+
+Список заметок и страница заметки обслуживаются асинхронными
+версиями (см. `notes/async_views.py`), остальные адреса — прежними
+CBV. Один рабочий процесс держит открытыми тысячи медленных
+соединений:
+
+    uvicorn yanote.asgi:application --workers 1
+
+`QueryBudgetMiddleware` умеет работать только синхронно, и Django
+выполнял бы ради неё каждый запрос в отдельном потоке, поэтому
+в этом профиле учёт бюджетов отключён: бюджеты проверяют тесты
+синхронного профиля. `ReplicaMiddleware` работает в цикле событий
+и остаётся: асинхронные страницы тоже читают с реплики.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import MIDDLEWARE
+
+ROOT_URLCONF = 'yanote.urls_asgi'
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware != 'yanote.budget.QueryBudgetMiddleware'
+]
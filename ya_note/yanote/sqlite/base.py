@@ -0,0 +1,46 @@
+"""
+SQLite с настройками для работы под нагрузкой.
+
+Подключается как `ENGINE = 'yanote.sqlite'`. Каждое новое соединение
+получает PRAGMA из `PRAGMAS`; их можно переопределить в
+`OPTIONS['pragmas']`:
+
+* `journal_mode=WAL` — читатели не ждут писателя, писатель не ждёт
+  читателей;
+* `synchronous=NORMAL` — в режиме WAL fsync только при контрольной
+  точке, транзакции остаются атомарными;
+* `mmap_size` и `cache_size` — страницы базы читаются из памяти.
+
+Ожидание блокировки задаётся стандартным `OPTIONS['timeout']`
+в секундах. Чтобы оно работало, транзакции начинаются с
+`BEGIN IMMEDIATE`: отложенная транзакция, которая сначала читала,
+а потом пишет, получает «database is locked» сразу, не дожидаясь
+таймаута.
+"""
+from django.db.backends.sqlite3 import base
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — в килобайтах: 64 МБ.
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = {**PRAGMAS, **params.pop('pragmas', {})}
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
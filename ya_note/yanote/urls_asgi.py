@@ -0,0 +1,17 @@
+"""Адреса ASGI-профиля: страницы чтения заменены асинхронными версиями."""
+from django.urls import include, path
+
+from notes import async_views
+from notes.urls import app_name, urlpatterns as notes_urlpatterns
+
+from .urls import urlpatterns as sync_urlpatterns
+
+notes_patterns = [
+    path('note/<slug:slug>/', async_views.note_detail, name='detail'),
+    path('notes/', async_views.notes_list, name='list'),
+] + notes_urlpatterns
+
+urlpatterns = [path('', include((notes_patterns, app_name)))] + [
+    pattern for pattern in sync_urlpatterns
+    if getattr(pattern, 'namespace', None) != app_name
+]